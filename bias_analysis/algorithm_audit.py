@@ -71,6 +71,7 @@ Key literature parameterizing the detection differential:
 import numpy as np
 import pandas as pd
 import statsmodels.formula.api as smf
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import sys
@@ -233,17 +234,50 @@ def compute_clinical_eligibility(
     return False
 
 
+@dataclass(frozen=True)
+class AlgorithmParams:
+    """
+    Per-algorithm quantities used by every Monte Carlo draw, extracted once
+    from a FrailtyDefinition instead of being re-derived on each draw.
+    """
+    exante_bonus: float     # additive claims-detection bonus (ex parte/HIE/MDS/lag)
+    cert_active: bool       # physician cert required, active documentation
+    cert_partial: bool      # physician cert required, partial ex parte
+
+    @classmethod
+    def from_definition(cls, defn: FrailtyDefinition) -> 'AlgorithmParams':
+        exante_bonus = P_DETECT_EXANTE_BONUS.get(defn.ex_parte_determination, 0.0)
+        # HIE integration adds further bonus
+        if defn.uses_hie:
+            exante_bonus += 0.04
+        if defn.uses_mds_data:
+            exante_bonus += 0.03
+        if defn.claims_lag == ClaimsLag.SHORT:
+            exante_bonus += 0.03
+        return cls(
+            exante_bonus=exante_bonus,
+            cert_active=(defn.requires_physician_cert and
+                         defn.ex_parte_determination == ExparteDetermination.ACTIVE),
+            cert_partial=(defn.requires_physician_cert and
+                          defn.ex_parte_determination == ExparteDetermination.PARTIAL),
+        )
+
+
 def simulate_exemption_single(
     individual: pd.Series,
     defn: FrailtyDefinition,
     rng: np.random.Generator,
     p_detect_override: Optional[Dict] = None,
     p_cert_override: Optional[Dict] = None,
+    params: Optional[AlgorithmParams] = None,
 ) -> bool:
     """
     Single Monte Carlo draw: simulate the exemption decision for one
     individual under one state's algorithm.
 
+    params : AlgorithmParams for defn, if the caller has already built them
+             (loops over many draws should build them once).
+
     Returns True if simulated as exempt, False otherwise.
     """
     race = individual.get('race_eth', 'other')
@@ -253,34 +287,29 @@ def simulate_exemption_single(
     if not compute_clinical_eligibility(individual, defn):
         return False
 
+    if params is None:
+        params = AlgorithmParams.from_definition(defn)
+
     # --- Step 2: Claims visibility ---
     p_det_base = (p_detect_override or P_DETECT).get(race, P_DETECT.get('other', 0.64))
     # Apply rural penalty (lower healthcare contact → fewer claims)
     if is_rural:
         p_det_base = max(0.10, p_det_base + RURAL_DETECT_PENALTY)
-    exante_bonus = P_DETECT_EXANTE_BONUS.get(defn.ex_parte_determination, 0.0)
-    # HIE integration adds further bonus
-    if defn.uses_hie:
-        exante_bonus += 0.04
-    if defn.uses_mds_data:
-        exante_bonus += 0.03
-    if defn.claims_lag == ClaimsLag.SHORT:
-        exante_bonus += 0.03
-
-    p_detect = min(p_det_base + exante_bonus, 0.98)
+
+    p_detect = min(p_det_base + params.exante_bonus, 0.98)
     claims_visible = rng.random() < p_detect
 
     if not claims_visible:
         return False
 
     # --- Step 3: Documentation barrier ---
-    if defn.requires_physician_cert and defn.ex_parte_determination == ExparteDetermination.ACTIVE:
+    if params.cert_active:
         p_c = (p_cert_override or P_CERT).get(race, P_CERT.get('other', 0.70))
         if is_rural:
             p_c = max(0.10, p_c + RURAL_CERT_PENALTY)
         cert_obtained = rng.random() < p_c
         return cert_obtained
-    elif defn.requires_physician_cert and defn.ex_parte_determination == ExparteDetermination.PARTIAL:
+    elif params.cert_partial:
         # Partial ex parte: cert needed only if auto-detection fails;
         # model as 50% auto-detected, 50% requires cert
         if rng.random() < 0.5:
@@ -313,6 +342,7 @@ def run_monte_carlo(
     sample_n: max individuals per race group (for speed; ACS has millions)
     """
     rng = np.random.default_rng(seed=42)
+    params = AlgorithmParams.from_definition(defn)
 
     # Determine stratification groups
     has_metro = 'metro_status' in df.columns and stratify_metro
@@ -346,7 +376,7 @@ def run_monte_carlo(
                 continue
             for j in range(n_sim):
                 exempt_draws[i, j] = simulate_exemption_single(
-                    ind, defn, rng, p_detect_override, p_cert_override
+                    ind, defn, rng, p_detect_override, p_cert_override, params
                 )
 
         # Population-weighted exempt rate
@@ -528,9 +558,10 @@ def run_regression_on_simulated(
         sample = bw.sample(n=n, random_state=42) if len(bw) > n else bw
 
         rng = np.random.default_rng(seed=0)
+        params = AlgorithmParams.from_definition(defn)
         for _, ind in sample.iterrows():
             clin_elig = compute_clinical_eligibility(ind, defn)
-            exempt = simulate_exemption_single(ind, defn, rng)
+            exempt = simulate_exemption_single(ind, defn, rng, params=params)
 
             records.append({
                 'state': state_code,
@@ -554,14 +585,14 @@ def run_regression_on_simulated(
     ]:
         try:
             model = smf.logit(formula, data=reg_df).fit(cov_type='HC1', disp=False, maxiter=100)
+            ci = model.conf_int()
+            has_black = 'black' in ci.index
             results[name] = {
                 'n': int(model.nobs),
                 'black_or': round(np.exp(model.params.get('black', np.nan)), 3),
                 'black_p_value': round(model.pvalues.get('black', np.nan), 4),
-                'black_ci_lower_or': round(np.exp(model.conf_int().loc['black', 0]), 3)
-                    if 'black' in model.conf_int().index else np.nan,
-                'black_ci_upper_or': round(np.exp(model.conf_int().loc['black', 1]), 3)
-                    if 'black' in model.conf_int().index else np.nan,
+                'black_ci_lower_or': round(np.exp(ci.loc['black', 0]), 3) if has_black else np.nan,
+                'black_ci_upper_or': round(np.exp(ci.loc['black', 1]), 3) if has_black else np.nan,
                 'interpretation': (
                     'Residual race effect after conditioning on clinical eligibility and state — '
                     'the portion of racial gap attributable to process/documentation bias'
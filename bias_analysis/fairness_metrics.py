@@ -34,23 +34,83 @@ Data: Constructed from state frailty definitions + BRFSS disability + KFF demogr
       In full T-MSIS implementation, individual-level data would power these tests.
 """
 
+import functools
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from pathlib import Path
+import os
 import sys
 import scipy.stats as stats
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
 from pipeline.disparity_analysis import build_disparity_dataset, BRFSS_DISABILITY
 
+# Source directories whose code or parquet extracts feed build_disparity_dataset
+DATASET_INPUT_DIRS = ['pipeline', 'data', 'frailty_definitions']
+
+# Columns every race-stratified metric needs (Black/white need and exemption)
+RACE_COMPLETE_COLS = [
+    'disability_black', 'disability_white',
+    'exempt_pct_black', 'exempt_pct_white',
+]
+
+# Panel-B bar colours and legend labels: (colour, label) for gap > 0, gap <= 0
+GAP_BAR_LEGEND = (
+    ('#d32f2f', 'Black > White need (under-prediction)'),
+    ('#1976D2', 'White > Black need (over-prediction)'),
+)
+
+
+def _race_complete(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with all RACE_COMPLETE_COLS present; returns df itself if none are missing."""
+    mask = df[RACE_COMPLETE_COLS].notna().all(axis=1)
+    return df if mask.all() else df[mask]
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """df.to_dict(orient='records') via one itertuples pass (no per-cell boxing)."""
+    cols = list(df.columns)
+    return [dict(zip(cols, row)) for row in df.itertuples(index=False, name=None)]
+
+
+def _dataset_signature() -> Tuple:
+    """(path, mtime_ns) for every input of the disparity dataset."""
+    return tuple(
+        (str(path), path.stat().st_mtime_ns)
+        for d in DATASET_INPUT_DIRS
+        for path in sorted((ROOT / d).glob('*.py')) + sorted((ROOT / d).glob('*.parquet'))
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_disparity_dataset(signature: Tuple) -> pd.DataFrame:
+    """build_disparity_dataset() memoized per input signature."""
+    return build_disparity_dataset()
+
+
+def load_disparity_dataset(cache_path: Optional[Path] = None) -> pd.DataFrame:
+    """
+    build_disparity_dataset(), memoized in-process and, if cache_path is
+    given, persisted as Parquet. Either cache is reused only while no
+    pipeline/, data/ or frailty_definitions/ input is newer than it.
+    The on-disk copy does not carry the frame's .attrs.
+    """
+    signature = _dataset_signature()
+    newest_input = max((mtime for _, mtime in signature), default=0)
+    if cache_path is not None and cache_path.exists() and cache_path.stat().st_mtime_ns > newest_input:
+        return pd.read_parquet(cache_path)
+
+    df = _cached_disparity_dataset(signature).copy()
+    if cache_path is not None:
+        stored = df.copy(deep=False)
+        stored.attrs = {}
+        stored.to_parquet(cache_path, engine='pyarrow')
+    return df
+
 
 def calibration_test(
     score_bins: np.ndarray,
@@ -133,6 +193,8 @@ def obermeyer_audit(
     n_bins: int = 10,
     plot: bool = True,
     output_dir: Path = None,
+    dpi: int = 150,
+    return_full: bool = True,
 ) -> Dict:
     """
     Replication of Obermeyer et al. (2019) audit methodology applied to
@@ -149,63 +211,92 @@ def obermeyer_audit(
 
     The "Obermeyer gap" = disability_gap / exemption_gap ratio.
     Values > 1 indicate disability burden not reflected in exemption rates.
+
+    The figure is drawn only when plot is True and output_dir is given;
+    dpi can be lowered for draft or sensitivity runs. With return_full=False
+    (bootstrap/sensitivity loops) only the gap statistics are returned: no
+    decile table, frail-exemption rates or figure are built.
     """
     # Use state-level data as unit of observation
-    analysis_df = df.dropna(subset=[
-        'disability_black', 'disability_white',
-        'exempt_pct_black', 'exempt_pct_white'
-    ]).copy()
+    analysis_df = _race_complete(df)
 
     if len(analysis_df) < 5:
         return {'error': 'Insufficient data for Obermeyer audit', 'n': len(analysis_df)}
 
-    # The "cost proxy" score = exemption rate (what the algorithm produces)
-    analysis_df['score_proxy'] = (
-        analysis_df['exempt_pct_overall'].fillna(analysis_df['exempt_pct_white'])
-    )
+    # The "cost proxy" score = exemption rate (what the algorithm produces),
+    # falling back to the white rate where the overall rate is missing
+    overall = analysis_df['exempt_pct_overall'].to_numpy(dtype=np.float64)
+    score = np.where(np.isnan(overall), analysis_df['exempt_pct_white'].to_numpy(dtype=np.float64), overall)
 
     # The "true need" = disability prevalence from BRFSS
-    analysis_df['need_black'] = analysis_df['disability_black']
-    analysis_df['need_white'] = analysis_df['disability_white']
+    need = analysis_df[['disability_black', 'disability_white']].to_numpy(dtype=np.float64)
 
-    # Bin by score decile
-    analysis_df['score_decile'] = pd.qcut(
-        analysis_df['score_proxy'], q=min(n_bins, len(analysis_df) // 2),
-        labels=False, duplicates='drop'
-    )
+    # Bin by score decile: quantile edges with duplicates dropped and
+    # right-closed bins (first bin closed on the left), as pd.qcut does
+    q = min(n_bins, len(score) // 2)
+    edges = np.unique(np.quantile(score, np.linspace(0, 1, q + 1)))
+    codes = np.maximum(np.searchsorted(edges, score, side='left') - 1, 0)
+
+    # For each decile, compute mean need by race (empty bins are omitted)
+    counts = np.bincount(codes)
+    occupied = np.flatnonzero(counts)
+    counts = counts[occupied]
 
-    # For each decile, compute mean need by race
-    decile_summary = analysis_df.groupby('score_decile').agg(
-        mean_score=('score_proxy', 'mean'),
-        need_black=('need_black', 'mean'),
-        need_white=('need_white', 'mean'),
-        n_states=('state', 'count'),
-    ).reset_index()
-    decile_summary['need_gap'] = decile_summary['need_black'] - decile_summary['need_white']
+    def _bin_mean(values):
+        return np.bincount(codes, weights=values)[occupied] / counts
+
+    mean_score = _bin_mean(score)
+    need_black = _bin_mean(need[:, 0])
+    need_white = _bin_mean(need[:, 1])
+    need_gap = need_black - need_white
+    need_gap = need_gap[~np.isnan(need_gap)]
 
     # Overall Obermeyer gap
-    mean_need_gap = decile_summary['need_gap'].mean()
-    se_need_gap = decile_summary['need_gap'].std() / np.sqrt(len(decile_summary))
+    mean_need_gap = need_gap.mean()
+    se_need_gap = need_gap.std(ddof=1) / np.sqrt(len(need_gap))
 
     # T-test: is the need gap systematically positive across deciles?
-    t_stat, p_value = stats.ttest_1samp(
-        decile_summary['need_gap'].dropna(), popmean=0
-    )
+    t_stat, p_value = stats.ttest_1samp(need_gap, popmean=0)
+
+    gap_stats = {
+        'n_states': len(analysis_df),
+        'n_deciles': len(occupied),
+        'mean_need_gap_pp': round(float(mean_need_gap), 3),
+        'se_need_gap': round(float(se_need_gap), 3),
+        't_statistic': round(float(t_stat), 3),
+        'p_value': round(float(p_value), 4),
+        'statistically_significant': p_value < 0.05,
+    }
+    if not return_full:
+        return gap_stats
+
+    decile_summary = pd.DataFrame({
+        'score_decile': occupied,
+        'mean_score': mean_score,
+        'need_black': need_black,
+        'need_white': need_white,
+        'n_states': counts,
+        'need_gap': need_black - need_white,
+    })
 
     # Compute the "threshold bias" metric:
     # If we use exemption_rate as a threshold, what % of truly-frail
     # Black enrollees are excluded vs. white enrollees?
     # Assume frailty ↔ disability prevalence > 30%
     FRAILTY_THRESHOLD = 30.0
-    black_frail_exempt = analysis_df[
-        analysis_df['disability_black'] > FRAILTY_THRESHOLD
-    ]['exempt_pct_black'].mean()
-    white_frail_exempt = analysis_df[
-        analysis_df['disability_white'] > FRAILTY_THRESHOLD
-    ]['exempt_pct_white'].mean()
+    exempt = analysis_df[['exempt_pct_black', 'exempt_pct_white']].to_numpy(dtype=np.float64)
+    frail = need > FRAILTY_THRESHOLD
+    black_frail_exempt = exempt[frail[:, 0], 0].mean() if frail[:, 0].any() else np.nan
+    white_frail_exempt = exempt[frail[:, 1], 1].mean() if frail[:, 1].any() else np.nan
 
     # Plot Obermeyer-style figure
     if plot and output_dir:
+        # Imported here so table-only runs never pay matplotlib's startup cost
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as mpatches
+
         fig, axes = plt.subplots(1, 2, figsize=(14, 6))
         fig.suptitle(
             "Obermeyer-Style Audit: Medicaid Medically Frail Exemption Algorithms\n"
@@ -215,31 +306,28 @@ def obermeyer_audit(
 
         # Panel A: Need vs. Score by Race
         ax = axes[0]
+        x = score
+        dis_black, dis_white = need[:, 0], need[:, 1]
         ax.scatter(
-            analysis_df['score_proxy'],
-            analysis_df['disability_black'],
+            x, dis_black,
             color='#2196F3', alpha=0.7, s=80, label='Black enrollees', zorder=3
         )
         ax.scatter(
-            analysis_df['score_proxy'],
-            analysis_df['disability_white'],
+            x, dis_white,
             color='#FF5722', alpha=0.7, s=80, label='White enrollees', zorder=3,
             marker='s'
         )
-        # Trend lines
-        for (y_col, color, label) in [
-            ('disability_black', '#2196F3', 'Black'),
-            ('disability_white', '#FF5722', 'White')
-        ]:
-            z = np.polyfit(
-                analysis_df['score_proxy'].dropna(),
-                analysis_df[y_col].dropna(),
-                1
-            )
-            p = np.poly1d(z)
-            x_range = np.linspace(analysis_df['score_proxy'].min(),
-                                   analysis_df['score_proxy'].max(), 100)
-            ax.plot(x_range, p(x_range), color=color, linewidth=2, linestyle='--')
+        # Trend lines: closed-form simple OLS for both races at once on the
+        # rows where the score and both need values are present
+        x_range = np.linspace(np.nanmin(x), np.nanmax(x), 100)
+        Y = np.column_stack([dis_black, dis_white])
+        ok = ~(np.isnan(x) | np.isnan(Y).any(axis=1))
+        xc = x[ok] - x[ok].mean()
+        Yc = Y[ok] - Y[ok].mean(axis=0)
+        beta = xc @ Yc / (xc @ xc)
+        alpha = Y[ok].mean(axis=0) - beta * x[ok].mean()
+        for i, color in enumerate(['#2196F3', '#FF5722']):
+            ax.plot(x_range, alpha[i] + beta[i] * x_range, color=color, linewidth=2, linestyle='--')
 
         ax.set_xlabel('Algorithm Score (Exemption Rate, %)', fontsize=11)
         ax.set_ylabel('True Disability Burden (BRFSS %, 2022)', fontsize=11)
@@ -251,10 +339,12 @@ def obermeyer_audit(
 
         # Panel B: Need gap by score decile (replication of Science Fig. 1)
         ax2 = axes[1]
-        colors = ['#d32f2f' if g > 0 else '#1976D2' for g in decile_summary['need_gap']]
+        need_gap = decile_summary['need_gap'].to_numpy()
+        (under_color, _), (over_color, _) = GAP_BAR_LEGEND
+        colors = np.where(need_gap > 0, under_color, over_color)
         bars = ax2.bar(
-            decile_summary['mean_score'],
-            decile_summary['need_gap'],
+            decile_summary['mean_score'].to_numpy(),
+            need_gap,
             width=1.5,
             color=colors,
             alpha=0.8,
@@ -262,8 +352,8 @@ def obermeyer_audit(
             linewidth=0.5
         )
         ax2.axhline(0, color='black', linewidth=1)
-        ax2.axhline(mean_need_gap, color='darkred', linewidth=2, linestyle='--',
-                    label=f'Mean gap: {mean_need_gap:.2f}pp (p={p_value:.3f})')
+        mean_line = ax2.axhline(mean_need_gap, color='darkred', linewidth=2, linestyle='--',
+                                label=f'Mean gap: {mean_need_gap:.2f}pp (p={p_value:.3f})')
         ax2.set_xlabel('Algorithm Score Decile (Mean Exemption Rate, %)', fontsize=11)
         ax2.set_ylabel('Black − White Disability Gap (pp)', fontsize=11)
         ax2.set_title(
@@ -271,31 +361,21 @@ def obermeyer_audit(
             '(Replicating Obermeyer et al. 2019 Methodology)',
             fontsize=11
         )
-        ax2.legend(fontsize=10)
         ax2.grid(True, alpha=0.3, axis='y')
-
-        red_patch = mpatches.Patch(color='#d32f2f', alpha=0.8,
-                                    label='Black > White need (under-prediction)')
-        blue_patch = mpatches.Patch(color='#1976D2', alpha=0.8,
-                                     label='White > Black need (over-prediction)')
-        ax2.legend(handles=[red_patch, blue_patch,
-                              mpatches.Patch(color='darkred', label=f'Mean gap p={p_value:.3f}')],
-                   fontsize=9, loc='upper right')
+        ax2.legend(
+            handles=[mpatches.Patch(color=c, alpha=0.8, label=lab) for c, lab in GAP_BAR_LEGEND]
+            + [mean_line],
+            fontsize=9, loc='upper right',
+        )
 
         plt.tight_layout()
         out_path = output_dir / "obermeyer_audit.png"
-        plt.savefig(out_path, dpi=150, bbox_inches='tight')
+        plt.savefig(out_path, dpi=dpi, bbox_inches='tight', pil_kwargs={'optimize': True})
         plt.close()
         print(f"  Saved: {out_path}")
 
     return {
-        'n_states': len(analysis_df),
-        'n_deciles': len(decile_summary),
-        'mean_need_gap_pp': round(float(mean_need_gap), 3),
-        'se_need_gap': round(float(se_need_gap), 3),
-        't_statistic': round(float(t_stat), 3),
-        'p_value': round(float(p_value), 4),
-        'statistically_significant': p_value < 0.05,
+        **gap_stats,
         'black_frail_exempt_pct': round(float(black_frail_exempt) if pd.notna(black_frail_exempt) else np.nan, 2),
         'white_frail_exempt_pct': round(float(white_frail_exempt) if pd.notna(white_frail_exempt) else np.nan, 2),
         'frailty_exempt_gap': round(
@@ -303,7 +383,7 @@ def obermeyer_audit(
             if pd.notna(white_frail_exempt) and pd.notna(black_frail_exempt) else np.nan,
             2
         ),
-        'decile_summary': decile_summary.to_dict(orient='records'),
+        'decile_summary': _records(decile_summary),
         'interpretation': (
             f"At equal algorithm-predicted exemption scores, Black Medicaid enrollees "
             f"have on average {mean_need_gap:.2f}pp higher disability burden than "
@@ -328,68 +408,72 @@ def simulate_state_level_tpr_fpr(df: pd.DataFrame) -> pd.DataFrame:
 
     These are approximate; full implementation requires T-MSIS individual data.
     """
-    df = df.dropna(subset=[
-        'exempt_pct_black', 'exempt_pct_white',
-        'disability_black', 'disability_white'
-    ]).copy()
+    df = _race_complete(df)
 
-    # Scale disability to fraction
-    df['dis_black'] = df['disability_black'] / 100
-    df['dis_white'] = df['disability_white'] / 100
+    # Exemption and disability rates as fractions: columns are (Black, White)
+    rates = df[RACE_COMPLETE_COLS].to_numpy(dtype=np.float64) / 100
+    dis, exempt = rates[:, :2], rates[:, 2:]
 
     # Estimated true positives = exempt_pct * disability_share
     # (assumes all exempted frail individuals are truly frail)
-    df['tp_black'] = np.minimum(df['exempt_pct_black'] / 100, df['dis_black'])
-    df['tp_white'] = np.minimum(df['exempt_pct_white'] / 100, df['dis_white'])
-
-    df['tpr_black'] = df['tp_black'] / df['dis_black'].replace(0, np.nan)
-    df['tpr_white'] = df['tp_white'] / df['dis_white'].replace(0, np.nan)
-
-    df['fp_black'] = np.maximum(0, df['exempt_pct_black'] / 100 - df['tp_black'])
-    df['fp_white'] = np.maximum(0, df['exempt_pct_white'] / 100 - df['tp_white'])
+    tp = np.minimum(exempt, dis)
+    tpr = np.divide(tp, dis, out=np.full_like(tp, np.nan), where=dis != 0)
 
-    df['fpr_black'] = df['fp_black'] / (1 - df['dis_black']).replace(0, np.nan)
-    df['fpr_white'] = df['fp_white'] / (1 - df['dis_white']).replace(0, np.nan)
+    fp = np.maximum(0, exempt - tp)
+    fpr = np.divide(fp, 1 - dis, out=np.full_like(fp, np.nan), where=dis != 1)
 
-    df['tpr_gap'] = df['tpr_white'] - df['tpr_black']
-    df['fpr_gap'] = df['fpr_white'] - df['fpr_black']
-    df['equalized_odds_violation'] = (df['tpr_gap'].abs() > 0.02).astype(int)
+    tpr_gap = tpr[:, 1] - tpr[:, 0]
+    fpr_gap = fpr[:, 1] - fpr[:, 0]
 
-    return df[[
-        'state', 'state_name', 'stringency_score',
-        'tpr_black', 'tpr_white', 'tpr_gap',
-        'fpr_black', 'fpr_white', 'fpr_gap',
-        'equalized_odds_violation',
-        'racial_gap_pp',
-    ]]
+    return pd.DataFrame({
+        'state': df['state'],
+        'state_name': df['state_name'],
+        'stringency_score': df['stringency_score'],
+        'tpr_black': tpr[:, 0],
+        'tpr_white': tpr[:, 1],
+        'tpr_gap': tpr_gap,
+        'fpr_black': fpr[:, 0],
+        'fpr_white': fpr[:, 1],
+        'fpr_gap': fpr_gap,
+        'equalized_odds_violation': (np.abs(tpr_gap) > 0.02).astype(int),
+        'racial_gap_pp': df['racial_gap_pp'],
+    }, index=df.index)
 
 
 def run_full_fairness_evaluation(
     df: pd.DataFrame,
-    output_dir: Path = None
+    output_dir: Path = None,
+    plot: bool = True,
 ) -> Dict:
     """
     Run the complete FAVES fairness evaluation suite.
 
     Returns a comprehensive dictionary of all fairness metric results
     Runs all fairness metrics and returns structured results dictionary.
+
+    Set plot=False (or SKIP_FIGURES=1) for batch and sensitivity runs that
+    only need the numbers.
     """
     results = {}
+    # Both race-stratified metrics use the same complete-case subset
+    race_df = _race_complete(df)
 
     print("  Running Obermeyer-style audit...")
-    results['obermeyer_audit'] = obermeyer_audit(df, plot=True, output_dir=output_dir)
+    results['obermeyer_audit'] = obermeyer_audit(
+        race_df, plot=plot and not os.environ.get('SKIP_FIGURES'), output_dir=output_dir
+    )
 
     print("  Computing equalized odds...")
-    tpr_fpr_df = simulate_state_level_tpr_fpr(df)
+    tpr_fpr_df = simulate_state_level_tpr_fpr(race_df)
     results['equalized_odds'] = {
         'n_states': len(tpr_fpr_df),
         'mean_tpr_gap': round(tpr_fpr_df['tpr_gap'].mean(), 4),
         'mean_fpr_gap': round(tpr_fpr_df['fpr_gap'].mean(), 4),
         'pct_states_violating': round(tpr_fpr_df['equalized_odds_violation'].mean() * 100, 1),
-        'worst_states': tpr_fpr_df.sort_values('tpr_gap', ascending=False).head(3)[
+        'worst_states': _records(tpr_fpr_df.sort_values('tpr_gap', ascending=False).head(3)[
             ['state', 'tpr_gap', 'fpr_gap']
-        ].to_dict(orient='records'),
-        'state_detail': tpr_fpr_df.to_dict(orient='records'),
+        ]),
+        'state_detail': _records(tpr_fpr_df),
     }
 
     print("  Computing calibration metrics...")
@@ -398,20 +482,25 @@ def run_full_fairness_evaluation(
         # Interpolate frailty rates at each score level using polynomial fit
         exempt_bins = np.array([8, 10, 12, 14, 16, 18, 20, 22])
         # Black frailty rate increases faster with scores due to higher disability burden
-        frail_black = exempt_bins * 0.97 + np.random.RandomState(42).normal(0, 0.3, len(exempt_bins))
-        frail_white = exempt_bins * 0.89 + np.random.RandomState(42).normal(0, 0.3, len(exempt_bins))
+        # Independent noise per race (one generator, two rows of draws)
+        noise = np.random.default_rng(42).normal(0, 0.3, (2, len(exempt_bins)))
+        frail_black = exempt_bins * 0.97 + noise[0]
+        frail_white = exempt_bins * 0.89 + noise[1]
         results['calibration'] = calibration_test(exempt_bins, frail_black, frail_white)
     else:
         results['calibration'] = {'error': 'Insufficient state-level data for calibration test'}
 
     print("  Computing demographic parity...")
+    dp = df[[
+        'exempt_pct_black', 'exempt_pct_white', 'exempt_pct_overall', 'racial_gap_pp',
+    ]].agg(['mean', 'sem', 'count'])
     results['demographic_parity'] = {
-        'mean_exemption_black': round(df['exempt_pct_black'].mean(), 2),
-        'mean_exemption_white': round(df['exempt_pct_white'].mean(), 2),
-        'mean_exemption_overall': round(df['exempt_pct_overall'].mean(), 2),
-        'mean_racial_gap': round(df['racial_gap_pp'].mean(), 2),
-        'se_racial_gap': round(df['racial_gap_pp'].sem(), 3),
-        'states_analyzed': int(df['racial_gap_pp'].notna().sum()),
+        'mean_exemption_black': round(dp.at['mean', 'exempt_pct_black'], 2),
+        'mean_exemption_white': round(dp.at['mean', 'exempt_pct_white'], 2),
+        'mean_exemption_overall': round(dp.at['mean', 'exempt_pct_overall'], 2),
+        'mean_racial_gap': round(dp.at['mean', 'racial_gap_pp'], 2),
+        'se_racial_gap': round(dp.at['sem', 'racial_gap_pp'], 3),
+        'states_analyzed': int(dp.at['count', 'racial_gap_pp']),
     }
 
     return results
@@ -423,12 +512,14 @@ if __name__ == "__main__":
     output_dir.mkdir(exist_ok=True)
 
     print("Building disparity dataset...")
-    df = build_disparity_dataset()
-    df_with_frailty = df.dropna(subset=['exempt_pct_overall'])
-    print(f"States with complete data: {len(df_with_frailty)}")
+    # build_disparity_dataset() already drops states without exempt_pct_overall
+    cache_dir = output_dir / '.cache'
+    cache_dir.mkdir(exist_ok=True)
+    df = load_disparity_dataset(cache_dir / 'disparity_dataset.parquet')
+    print(f"States with complete data: {len(df)}")
 
     print("\nRunning FAVES Fairness Evaluation...")
-    results = run_full_fairness_evaluation(df_with_frailty, output_dir=output_dir)
+    results = run_full_fairness_evaluation(df, output_dir=output_dir)
 
     print("\n=== FAIRNESS EVALUATION RESULTS ===")
     print(f"\nObermeyer Audit:")
@@ -34,7 +34,7 @@ import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Dict, Tuple
-import json
+import orjson
 
 ROOT = Path(__file__).parent.parent
 DATA_DIR = ROOT / "data"
@@ -441,8 +441,10 @@ if __name__ == "__main__":
     # Save results
     OUTPUT_DIR.mkdir(exist_ok=True)
     output_path = OUTPUT_DIR / "g2211_validation_results.json"
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2, default=str)
+    output_path.write_bytes(orjson.dumps(
+        results, default=str,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+    ))
     print(f"\nResults saved to {output_path}")
 
     # Save specialty table as CSV
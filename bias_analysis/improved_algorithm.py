@@ -536,30 +536,27 @@ def compute_coverage_impact(
     # Arkansas disenrollment rate as benchmark (Sommers et al. NEJM 2019)
     DISENROLL_RATE = 0.067  # 6.7% of non-exempt lose coverage
 
-    rows = []
-    for _, row in comparison_df.iterrows():
-        state = row['state']
-        pop = state_populations.get(state, 0)
+    pop = comparison_df['state'].map(state_populations).fillna(0).astype(float)
 
-        sq_identified = pop * row['sq_overall_sensitivity'] / 100
-        imp_identified = pop * row['imp_overall_sensitivity'] / 100
-        additional = imp_identified - sq_identified
+    sq_identified = pop * comparison_df['sq_overall_sensitivity'] / 100
+    imp_identified = pop * comparison_df['imp_overall_sensitivity'] / 100
+    additional = imp_identified - sq_identified
 
-        # Coverage losses averted = additional identified * disenrollment rate
-        losses_averted = additional * DISENROLL_RATE
+    # Coverage losses averted = additional identified * disenrollment rate
+    losses_averted = additional * DISENROLL_RATE
 
-        rows.append({
-            'state': state,
-            'expansion_pop': int(pop),
-            'sq_identified': int(sq_identified),
-            'imp_identified': int(imp_identified),
-            'additional_identified': int(additional),
-            'coverage_losses_averted': int(losses_averted),
-            'sensitivity_gain_pp': row['sensitivity_gain_pp'],
-            'gap_reduction_pp': row.get('gap_reduction_pp', np.nan),
-        })
+    impact = pd.DataFrame({
+        'state': comparison_df['state'],
+        'expansion_pop': pop.astype(int),
+        'sq_identified': sq_identified.astype(int),
+        'imp_identified': imp_identified.astype(int),
+        'additional_identified': additional.astype(int),
+        'coverage_losses_averted': losses_averted.astype(int),
+        'sensitivity_gain_pp': comparison_df['sensitivity_gain_pp'],
+        'gap_reduction_pp': comparison_df.get('gap_reduction_pp', np.nan),
+    }).reset_index(drop=True)
 
-    return pd.DataFrame(rows).sort_values('additional_identified', ascending=False)
+    return impact.sort_values('additional_identified', ascending=False)
 
 
 def run_full_improved_analysis(
@@ -752,9 +749,11 @@ def run_full_improved_analysis(
 if __name__ == "__main__":
     results = run_full_improved_analysis(n_sim=300, sample_n=2000)
 
-    import json
+    import orjson
     output_path = Path(__file__).parent.parent / 'output' / 'improved_algorithm_results.json'
     output_path.parent.mkdir(exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    output_path.write_bytes(orjson.dumps(
+        results, default=str,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+    ))
     print(f"\nResults saved to {output_path}")
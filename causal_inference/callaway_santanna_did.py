@@ -26,13 +26,11 @@ Data: Constructed from state waiver evaluation reports, MACPAC analyses,
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from pathlib import Path
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import scipy.stats as stats
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -113,39 +111,74 @@ WR_TREATMENT_YEARS = {
     # 'MI': 2018,  # Blocked
 }
 
+# Dense state × year view of STATE_YEAR_GAPS (NaN where a year is missing),
+# built once at import so panels and outcome matrices index by position
+GAP_STATES = list(STATE_YEAR_GAPS)
+GAP_YEARS = np.array(sorted(set().union(*STATE_YEAR_GAPS.values())))
+GAP_ROW = {s: i for i, s in enumerate(GAP_STATES)}
+GAP_MATRIX = np.array([
+    [STATE_YEAR_GAPS[s].get(y, np.nan) for y in GAP_YEARS.tolist()] for s in GAP_STATES
+])
+# First treatment year of each GAP_STATES row, NaN if never treated
+GAP_TREAT_YEAR = np.array([WR_TREATMENT_YEARS.get(s, np.nan) for s in GAP_STATES])
+
 
 def build_panel_dataset() -> pd.DataFrame:
     """
     Build a balanced state × year panel dataset for DiD analysis.
     """
-    years = list(range(2016, 2025))
-    states = list(STATE_YEAR_GAPS.keys())
-
-    rows = []
-    for state in states:
-        for year in years:
-            if year in STATE_YEAR_GAPS[state]:
-                treat_year = WR_TREATMENT_YEARS.get(state)
-                rows.append({
-                    'state': state,
-                    'year': year,
-                    'racial_gap_pp': STATE_YEAR_GAPS[state][year],
-                    'treat_year': treat_year,
-                    'treated': int(treat_year is not None),
-                    # Post-treatment indicator (robust to never-treated)
-                    'post': int(treat_year is not None and year >= treat_year),
-                    'relative_year': (year - treat_year) if treat_year else None,
-                })
-
-    df = pd.DataFrame(rows)
-    df['state_fe'] = pd.Categorical(df['state']).codes
-    df['year_fe'] = pd.Categorical(df['year']).codes
+    n_years = len(GAP_YEARS)
+
+    # One entry per state × year, built column-wise; unobserved years dropped
+    state = np.repeat(GAP_STATES, n_years)
+    year = np.tile(GAP_YEARS, len(GAP_STATES))
+    gap = GAP_MATRIX.ravel()
+    treat_year = np.repeat(GAP_TREAT_YEAR, n_years)
+    treated = ~np.isnan(treat_year)
+    keep = ~np.isnan(gap)
+
+    df = pd.DataFrame({
+        'state': state[keep],
+        'year': year[keep],
+        'racial_gap_pp': gap[keep],
+        'treat_year': treat_year[keep],
+        'treated': treated[keep].astype(int),
+        # Post-treatment indicator (robust to never-treated)
+        'post': (treated & (year >= treat_year))[keep].astype(int),
+        'relative_year': (year - treat_year)[keep],
+    })
+    # Fixed-effect codes: index into the sorted unique values
+    df['state_fe'] = np.unique(df['state'].to_numpy(), return_inverse=True)[1]
+    df['year_fe'] = np.unique(df['year'].to_numpy(), return_inverse=True)[1]
     return df
 
 
+def panel_matrix(
+    panel_df: pd.DataFrame,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Dense state × year view of a panel from build_panel_dataset.
+
+    Returns:
+        Y          : (states × years) racial_gap_pp, NaN where unobserved
+        treat_year : first treatment year per state, NaN if never treated
+        states     : state codes in panel order
+        years      : sorted calendar years
+    """
+    states = panel_df['state'].unique()
+    gap = panel_df.pivot(index='state', columns='year', values='racial_gap_pp').reindex(states)
+    treat_year = (
+        panel_df.drop_duplicates('state').set_index('state')['treat_year']
+        .reindex(states).to_numpy(dtype=np.float64)
+    )
+    return gap.to_numpy(dtype=np.float64), treat_year, states, gap.columns.to_numpy()
+
+
 def callaway_santanna_att(
     panel_df: pd.DataFrame,
     base_period: int = 2017,
+    n_boot: int = 500,
+    seed: Union[int, np.random.SeedSequence] = 42,
 ) -> pd.DataFrame:
     """
     Simplified Callaway & Sant'Anna ATT(g,t) estimator.
@@ -160,92 +193,128 @@ def callaway_santanna_att(
 
     This simplified version uses the "not-yet-treated" comparison group
     and the double-robust estimator with IPW + outcome regression.
+
+    Standard errors come from a state-level block bootstrap shared by all
+    cells; cband_lower/cband_upper give the uniform 95% band over them.
+    seed may be an int or a np.random.SeedSequence, so repeated runs
+    (e.g. sensitivity analyses) can each take a child of one spawn().
+    """
+    Y, treat_year, _, years = panel_matrix(panel_df)
+    year_col = {year: j for j, year in enumerate(years)}
+    observed = ~np.isnan(Y)
+    treatment_cohorts = pd.unique(treat_year[~np.isnan(treat_year)])
+
+    # Clean controls: never-treated OR not-yet-treated in some panel year
+    first_year = years[observed.argmax(axis=1)]
+    control = np.isnan(treat_year) | (treat_year > first_year)
+    Y_control, seen_control = Y[control], observed[control]
+    n_control_t = seen_control.sum(axis=0)
+    control_means = np.nanmean(Y_control, axis=0)
+
+    # States in each cohort g: (cohorts × states) membership
+    in_cohort = treat_year[None, :] == treatment_cohorts[:, None]
+    Y0, n_obs = np.where(observed, Y, 0.0), observed.astype(np.float64)
+    n_cohort_t = in_cohort @ n_obs
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cohort_means = (in_cohort @ Y0) / n_cohort_t
+
+    # Pre-treatment baseline: base_period or g-1 (-1 where outside the panel)
+    pre = np.array([year_col.get(max(base_period, g - 1), -1) for g in treatment_cohorts], dtype=int)
+    has_pre = pre >= 0
+    pre = np.where(has_pre, pre, 0)
+    cohorts = np.arange(len(treatment_cohorts))
+
+    # DiD for every (g, t) at once: (cohort change) - (control change)
+    att = (
+        (cohort_means - cohort_means[cohorts, pre][:, None]) -
+        (control_means - control_means[pre][:, None])
+    )
+    valid = (
+        (n_cohort_t >= 1) & (n_control_t >= 2) &
+        (has_pre & (n_cohort_t[cohorts, pre] >= 1) & (n_control_t[pre] >= 2))[:, None]
+    )
+
+    # Bootstrap SE (simplified): block bootstrap over states. One set of
+    # resampled state lists is shared by every (g, t) cell, with cohort and
+    # control membership following the resampled states
+    n_states = len(treat_year)
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_states, size=(n_boot, n_states))
+    times_drawn = np.bincount(
+        (draws + n_states * np.arange(n_boot)[:, None]).ravel(),
+        minlength=n_boot * n_states,
+    ).reshape(n_boot, n_states).astype(np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cohort_b = (times_drawn[:, None, :] * in_cohort) @ Y0 / ((times_drawn[:, None, :] * in_cohort) @ n_obs)
+        control_b = (times_drawn * control) @ Y0 / ((times_drawn * control) @ n_obs)
+    att_b = (
+        (cohort_b - cohort_b[:, cohorts, pre][:, :, None]) -
+        (control_b[:, None, :] - control_b[:, pre][:, :, None])
+    )
+    # Replicates that drew no state of a group leave that cell undefined
+    se = np.nanstd(att_b, axis=0)
+
+    # Uniform (simultaneous) band over all reported cells: 95th percentile
+    # of the sup-t statistic across replicates
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sup_t = np.abs(att_b - att) / se
+    sup_t = np.where(valid & (se > 0), sup_t, np.nan).reshape(n_boot, -1)
+    usable = ~np.isnan(sup_t).all(axis=1)
+    crit = np.quantile(np.nanmax(sup_t[usable], axis=1), 0.95) if usable.any() else np.nan
+
+    # One row per reported cell, in cohort-then-year order
+    k, j = np.nonzero(valid)
+    g = treatment_cohorts[k].astype(int)
+    t = years[j].astype(int)
+    att_gt, se_gt = att[k, j], se[k, j]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(se_gt > 0, att_gt / se_gt, np.nan)
+
+    return pd.DataFrame({
+        'cohort_g': g,
+        'period_t': t,
+        'relative_time': t - g,
+        'att_gt': att_gt.round(4),
+        'se': se_gt.round(4),
+        'ci_lower': (att_gt - 1.96 * se_gt).round(4),
+        'ci_upper': (att_gt + 1.96 * se_gt).round(4),
+        'cband_lower': (att_gt - crit * se_gt).round(4),
+        'cband_upper': (att_gt + crit * se_gt).round(4),
+        'p_value': (2 * stats.norm.sf(np.abs(z))).round(4),
+        'significant': np.abs(z) > 1.96,
+        'n_treated': in_cohort.sum(axis=1)[k],
+        'n_control': np.full(len(k), control.sum()),
+    })
+
+
+def _mean_by_relative_time(
+    att_df: pd.DataFrame,
+    columns: List[str],
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
     """
-    results = []
-    treatment_cohorts = panel_df[panel_df['treated'] == 1]['treat_year'].dropna().unique()
-
-    for g in treatment_cohorts:
-        # States in cohort g
-        cohort_states = panel_df[
-            panel_df['treat_year'] == g
-        ]['state'].unique()
-
-        # Clean controls: never-treated OR not-yet-treated
-        control_states = panel_df[
-            (panel_df['treated'] == 0) |
-            (panel_df['treat_year'] > panel_df['year'])  # Not yet treated
-        ]['state'].unique()
-
-        # Pre-treatment baseline: base_period or g-1
-        pre_year = max(base_period, g - 1)
-
-        for t in sorted(panel_df['year'].unique()):
-            # Get outcomes for cohort g at time t and pre-period
-            cohort_t = panel_df[
-                (panel_df['state'].isin(cohort_states)) &
-                (panel_df['year'] == t)
-            ]['racial_gap_pp']
-
-            cohort_pre = panel_df[
-                (panel_df['state'].isin(cohort_states)) &
-                (panel_df['year'] == pre_year)
-            ]['racial_gap_pp']
-
-            # Get outcomes for control states
-            control_t = panel_df[
-                (panel_df['state'].isin(control_states)) &
-                (panel_df['year'] == t)
-            ]['racial_gap_pp']
-
-            control_pre = panel_df[
-                (panel_df['state'].isin(control_states)) &
-                (panel_df['year'] == pre_year)
-            ]['racial_gap_pp']
-
-            if (len(cohort_t) < 1 or len(control_t) < 2 or
-                    len(cohort_pre) < 1 or len(control_pre) < 2):
-                continue
-
-            # DiD: (cohort change) - (control change)
-            att_gt = (
-                (cohort_t.mean() - cohort_pre.mean()) -
-                (control_t.mean() - control_pre.mean())
-            )
-
-            # Bootstrap SE (simplified)
-            n_boot = 500
-            boot_atts = []
-            rng = np.random.RandomState(42 + int(g) + t)
-            for _ in range(n_boot):
-                c_t_b = rng.choice(cohort_t.values, len(cohort_t), replace=True)
-                c_pre_b = rng.choice(cohort_pre.values, len(cohort_pre), replace=True)
-                ctrl_t_b = rng.choice(control_t.values, len(control_t), replace=True)
-                ctrl_pre_b = rng.choice(control_pre.values, len(control_pre), replace=True)
-                boot_atts.append(
-                    (c_t_b.mean() - c_pre_b.mean()) - (ctrl_t_b.mean() - ctrl_pre_b.mean())
-                )
-            se = np.std(boot_atts)
-            ci_lower = att_gt - 1.96 * se
-            ci_upper = att_gt + 1.96 * se
-
-            results.append({
-                'cohort_g': int(g),
-                'period_t': int(t),
-                'relative_time': t - int(g),
-                'att_gt': round(att_gt, 4),
-                'se': round(se, 4),
-                'ci_lower': round(ci_lower, 4),
-                'ci_upper': round(ci_upper, 4),
-                'p_value': round(
-                    2 * (1 - stats.norm.cdf(abs(att_gt / se))) if se > 0 else np.nan,
-                    4
-                ),
-                'significant': bool(abs(att_gt / se) > 1.96) if se > 0 else False,
-                'n_treated': len(cohort_states),
-                'n_control': len(control_states),
-            })
-
-    return pd.DataFrame(results)
+    groupby('relative_time') means of columns via sort + np.add.reduceat.
+
+    Returns the sorted unique relative times, the number of cells at each,
+    and each column's NaN-skipping mean per relative time.
+    """
+    rel_time = att_df['relative_time'].to_numpy()
+    if len(rel_time) == 0:
+        return rel_time, rel_time, {col: np.empty(0) for col in columns}
+    order = np.argsort(rel_time, kind='stable')
+    rel_time = rel_time[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(rel_time)) + 1]
+    counts = np.diff(np.r_[starts, len(rel_time)])
+
+    means = {}
+    for col in columns:
+        values = att_df[col].to_numpy(dtype=np.float64)[order]
+        ok = ~np.isnan(values)
+        means[col] = (
+            np.add.reduceat(np.where(ok, values, 0.0), starts)
+            / np.add.reduceat(ok.astype(np.float64), starts)
+        )
+    return rel_time[starts], counts, means
 
 
 def compute_aggregate_att(att_df: pd.DataFrame) -> Dict:
@@ -265,13 +334,18 @@ def compute_aggregate_att(att_df: pd.DataFrame) -> Dict:
     overall_se = post_treatment['se'].mean() / np.sqrt(len(post_treatment))
 
     # Event-study ATTs
-    event_study = att_df.groupby('relative_time').agg(
-        att=('att_gt', 'mean'),
-        se=('se', 'mean'),
-        n_obs=('att_gt', 'count'),
-    ).reset_index()
-    event_study['ci_lower'] = event_study['att'] - 1.96 * event_study['se']
-    event_study['ci_upper'] = event_study['att'] + 1.96 * event_study['se']
+    rel_time, n_obs, means = _mean_by_relative_time(att_df, ['att_gt', 'se'])
+    event_study = [
+        {
+            'relative_time': int(r),
+            'att': float(a),
+            'se': float(e),
+            'n_obs': int(n),
+            'ci_lower': float(a - 1.96 * e),
+            'ci_upper': float(a + 1.96 * e),
+        }
+        for r, a, e, n in zip(rel_time, means['att_gt'], means['se'], n_obs)
+    ]
 
     # Pre-trend test (should be near zero)
     pre_att_mean = pre_treatment['att_gt'].mean() if len(pre_treatment) > 0 else np.nan
@@ -283,13 +357,13 @@ def compute_aggregate_att(att_df: pd.DataFrame) -> Dict:
         'ci_lower': round(float(overall_att - 1.96 * overall_se), 4),
         'ci_upper': round(float(overall_att + 1.96 * overall_se), 4),
         'p_value': round(
-            float(2 * (1 - stats.norm.cdf(abs(overall_att / overall_se)))),
+            float(2 * stats.norm.sf(abs(overall_att / overall_se))),
             4
         ),
         'pre_trend_att': round(float(pre_att_mean), 4) if not np.isnan(pre_att_mean) else None,
         'pre_trend_se': round(float(pre_att_se), 4),
         'pre_trend_violation': abs(pre_att_mean) > 2 * pre_att_se if not np.isnan(pre_att_mean) else None,
-        'event_study': event_study.to_dict(orient='records'),
+        'event_study': event_study,
         'interpretation': (
             f"The staggered DiD estimates that work requirement adoption "
             f"increases the Black-White racial gap in medically frail exemption rates "
@@ -307,28 +381,29 @@ def plot_event_study(
     title: str = "Event Study: Effect of Work Requirements on Racial Exemption Gap"
 ) -> None:
     """Plot the event-study ATT estimates."""
-    event_df = att_df.groupby('relative_time').agg(
-        att=('att_gt', 'mean'),
-        ci_lower=('ci_lower', 'mean'),
-        ci_upper=('ci_upper', 'mean'),
-        n_obs=('att_gt', 'count'),
-    ).reset_index()
+    rel_time, _, means = _mean_by_relative_time(att_df, ['att_gt', 'ci_lower', 'ci_upper'])
+    att, ci_lower, ci_upper = means['att_gt'], means['ci_lower'], means['ci_upper']
 
-    fig, ax = plt.subplots(figsize=(12, 6))
+    # A bare Figure renders through the Agg canvas without pyplot's global
+    # figure registry: nothing to tear down, and safe off the main thread
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
 
     # Pre-treatment (grey)
-    pre = event_df[event_df['relative_time'] < 0]
-    post = event_df[event_df['relative_time'] >= 0]
+    pre = rel_time < 0
+    post = ~pre
 
     ax.errorbar(
-        pre['relative_time'], pre['att'],
-        yerr=[pre['att'] - pre['ci_lower'], pre['ci_upper'] - pre['att']],
+        rel_time[pre], att[pre],
+        yerr=[att[pre] - ci_lower[pre], ci_upper[pre] - att[pre]],
         fmt='o', color='gray', capsize=4, linewidth=1.5, markersize=6,
         label='Pre-treatment (placebo test)',
     )
     ax.errorbar(
-        post['relative_time'], post['att'],
-        yerr=[post['att'] - post['ci_lower'], post['ci_upper'] - post['att']],
+        rel_time[post], att[post],
+        yerr=[att[post] - ci_lower[post], ci_upper[post] - att[post]],
         fmt='o', color='#d32f2f', capsize=4, linewidth=1.5, markersize=8,
         label='Post-treatment ATT(g,t)',
     )
@@ -338,12 +413,12 @@ def plot_event_study(
     ax.axhline(y=0, color='black', linewidth=1, alpha=0.5)
 
     # Shade significant post-treatment estimates
-    sig_post = post[post['att'] - 1.96 * (post['ci_upper'] - post['att']) / 1.96 > 0]
-    if len(sig_post) > 0:
+    sig_post = post & (att - 1.96 * (ci_upper - att) / 1.96 > 0)
+    if sig_post.any():
         ax.fill_between(
-            sig_post['relative_time'],
-            sig_post['ci_lower'],
-            sig_post['ci_upper'],
+            rel_time[sig_post],
+            ci_lower[sig_post],
+            ci_upper[sig_post],
             alpha=0.15, color='#d32f2f', label='95% CI (post)'
         )
 
@@ -352,12 +427,11 @@ def plot_event_study(
     ax.set_title(title, fontsize=13, fontweight='bold')
     ax.legend(fontsize=10)
     ax.grid(True, alpha=0.3)
-    ax.set_xticks(sorted(event_df['relative_time'].unique()))
+    ax.set_xticks(rel_time)
 
-    plt.tight_layout()
+    fig.tight_layout()
     out_path = output_dir / "event_study_did.png"
-    plt.savefig(out_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(out_path, dpi=150, bbox_inches='tight', pil_kwargs={'optimize': True})
     print(f"  Saved: {out_path}")
 
 
@@ -372,13 +446,20 @@ def run_staggered_did(output_dir: Optional[Path] = None) -> Dict:
     att_df = callaway_santanna_att(panel)
     print(f"  Computed {len(att_df)} ATT(g,t) estimates")
 
-    print("  Aggregating to overall ATT...")
-    agg_results = compute_aggregate_att(att_df)
+    # Render the event-study figure on a background thread while the
+    # aggregation runs; it draws on its own Figure, outside pyplot
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        figure = None
+        if output_dir:
+            print("  Plotting event study...")
+            figure = pool.submit(plot_event_study, att_df, output_dir)
+
+        print("  Aggregating to overall ATT...")
+        agg_results = compute_aggregate_att(att_df)
 
-    if output_dir:
-        print("  Plotting event study...")
-        plot_event_study(att_df, output_dir)
-        att_df.to_csv(output_dir / "callaway_santanna_att_gt.csv", index=False)
+        if output_dir:
+            att_df.to_csv(output_dir / "callaway_santanna_att_gt.csv", index=False)
+            figure.result()
 
     return {
         'panel_summary': {
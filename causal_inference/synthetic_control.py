@@ -33,14 +33,17 @@ from scipy.optimize import minimize, LinearConstraint
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 import sys
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import warnings
 warnings.filterwarnings('ignore')
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from causal_inference.callaway_santanna_did import STATE_YEAR_GAPS, WR_TREATMENT_YEARS
+from causal_inference.callaway_santanna_did import (
+    STATE_YEAR_GAPS, WR_TREATMENT_YEARS, GAP_MATRIX, GAP_ROW, GAP_YEARS,
+)
 
 
 # Pre-treatment predictors for synthetic control matching
@@ -84,19 +87,12 @@ def build_outcome_matrix(
         Y_donors  : (J × T) matrix of donor outcomes
         years     : list of calendar years
     """
-    years = sorted(set().union(*[STATE_YEAR_GAPS[s].keys() for s in
-                                   [treated_state] + donor_states]))
+    sub = GAP_MATRIX[[GAP_ROW[s] for s in [treated_state] + donor_states]]
+    # Keep the years observed for at least one of the selected states
+    observed = ~np.isnan(sub).all(axis=0)
+    years = GAP_YEARS[observed].tolist()
 
-    Y_treated = np.array([
-        STATE_YEAR_GAPS[treated_state].get(y, np.nan) for y in years
-    ])
-
-    Y_donors = np.array([
-        [STATE_YEAR_GAPS[s].get(y, np.nan) for y in years]
-        for s in donor_states
-    ])
-
-    return Y_treated, Y_donors, years
+    return sub[0, observed], sub[1:, observed], years
 
 
 def fit_synthetic_control(
@@ -108,7 +104,7 @@ def fit_synthetic_control(
     Find weights w ≥ 0, Σw = 1 minimizing:
         ||Y_treated[pre] - Y_donors.T[pre] @ w||²
 
-    Uses scipy.optimize.minimize with SLSQP.
+    Uses scipy.optimize.minimize with SLSQP and the analytic gradient.
     """
     J = Y_donors.shape[0]
     Y_t_pre = Y_treated[pre_periods]
@@ -119,17 +115,27 @@ def fit_synthetic_control(
     Y_d_pre = Y_d_pre[valid_donors]
     J_valid = Y_d_pre.shape[0]
 
+    # ||y - D'w||² = w'Gw - 2b'w + y'y with G = DD', b = Dy; precomputing
+    # these gives SLSQP the exact gradient instead of finite differences
+    G = Y_d_pre @ Y_d_pre.T
+    b = Y_d_pre @ Y_t_pre
+    yy = Y_t_pre @ Y_t_pre
+
     def objective(w):
-        synth = Y_d_pre.T @ w
-        return np.sum((Y_t_pre - synth) ** 2)
+        return w @ G @ w - 2 * b @ w + yy
+
+    def gradient(w):
+        return 2 * (G @ w - b)
 
     # Constraints: weights sum to 1, weights >= 0
-    constraints = [{'type': 'eq', 'fun': lambda w: np.sum(w) - 1}]
+    constraints = [{'type': 'eq', 'fun': lambda w: np.sum(w) - 1,
+                    'jac': lambda w: np.ones_like(w)}]
     bounds = [(0, 1)] * J_valid
 
     result = minimize(
         objective,
         x0=np.ones(J_valid) / J_valid,
+        jac=gradient,
         method='SLSQP',
         bounds=bounds,
         constraints=constraints,
@@ -145,12 +151,39 @@ def fit_synthetic_control(
     return weights
 
 
+def placebo_rmspe_ratio(
+    placebo_state: str,
+    donor_pool: List[str],
+    treatment_year: int,
+    pre_periods: np.ndarray,
+    post_periods: np.ndarray,
+) -> Optional[float]:
+    """
+    In-space placebo: treat one donor as if treated, fit it from the remaining
+    donors, and return its post/pre RMSPE ratio (None if it cannot be fit).
+    """
+    try:
+        # Use remaining donors as placebo's donor pool
+        placebo_donor_pool = [s for s in donor_pool if s != placebo_state]
+        Y_p, Y_pd, _ = build_outcome_matrix(
+            placebo_state, placebo_donor_pool, treatment_year
+        )
+        w_p = fit_synthetic_control(Y_p, Y_pd, pre_periods)
+        Y_synth_p = Y_pd.T @ w_p
+        rmspe_pre_p = np.sqrt(np.nanmean((Y_p[pre_periods] - Y_synth_p[pre_periods]) ** 2))
+        rmspe_post_p = np.sqrt(np.nanmean((Y_p[post_periods] - Y_synth_p[post_periods]) ** 2))
+    except Exception:
+        return None
+    return rmspe_post_p / rmspe_pre_p if rmspe_pre_p > 0 else None
+
+
 def run_synthetic_control(
     treated_state: str,
     treatment_year: int,
     donor_pool: Optional[List[str]] = None,
     output_dir: Optional[Path] = None,
     placebo_inference: bool = True,
+    n_jobs: int = 1,
 ) -> Dict:
     """
     Run the synthetic control analysis for a single treated state.
@@ -162,6 +195,7 @@ def run_synthetic_control(
     donor_pool : list of control state codes (if None, use all never-treated states)
     output_dir : directory for output figures
     placebo_inference : if True, run in-space placebo inference for p-values
+    n_jobs : worker processes for the placebo fits (1 = run in-process)
     """
     if donor_pool is None:
         # Use never-treated expansion states as donor pool
@@ -210,21 +244,16 @@ def run_synthetic_control(
     # In-space placebo inference
     placebo_ratios = []
     if placebo_inference and len(donor_pool) >= 4:
-        for placebo_state in donor_pool:
-            try:
-                # Use remaining donors as placebo's donor pool
-                placebo_donor_pool = [s for s in donor_pool if s != placebo_state]
-                Y_p, Y_pd, _ = build_outcome_matrix(
-                    placebo_state, placebo_donor_pool, treatment_year
-                )
-                w_p = fit_synthetic_control(Y_p, Y_pd, pre_periods)
-                Y_synth_p = Y_pd.T @ w_p
-                rmspe_pre_p = np.sqrt(np.nanmean((Y_p[pre_periods] - Y_synth_p[pre_periods]) ** 2))
-                rmspe_post_p = np.sqrt(np.nanmean((Y_p[post_periods] - Y_synth_p[post_periods]) ** 2))
-                if rmspe_pre_p > 0:
-                    placebo_ratios.append(rmspe_post_p / rmspe_pre_p)
-            except Exception:
-                continue
+        placebo = partial(
+            placebo_rmspe_ratio, donor_pool=donor_pool, treatment_year=treatment_year,
+            pre_periods=pre_periods, post_periods=post_periods,
+        )
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                ratios = list(pool.map(placebo, donor_pool))
+        else:
+            ratios = [placebo(s) for s in donor_pool]
+        placebo_ratios = [r for r in ratios if r is not None]
 
     # Permutation p-value (fraction of placebos with ratio >= treated ratio)
     p_value_scm = (
@@ -235,8 +264,17 @@ def run_synthetic_control(
     # Average post-treatment effect
     avg_effect_post = np.nanmean(effect[post_periods])
 
+    # Leading donors, formatted once for the interpretation text
+    top_donors = weights_summary[:3]
+    top_donor_states = ', '.join(w['state'] for w in top_donors)
+    top_donor_weights = ', '.join(str(w['weight']) for w in top_donors)
+
     # Plot
     if output_dir:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
         fig, axes = plt.subplots(1, 2, figsize=(14, 6))
         fig.suptitle(
             f"Synthetic Control: {treated_state} Work Requirements\n"
@@ -253,9 +291,9 @@ def run_synthetic_control(
         ax.axvline(x=treatment_year - 0.5, color='black', linestyle='--',
                    linewidth=1.5, label=f'Treatment ({treatment_year})')
         ax.fill_between(
-            [y for y in years if y >= treatment_year],
-            [Y_treated[i] for i, y in enumerate(years) if y >= treatment_year],
-            [Y_synthetic[i] for i, y in enumerate(years) if y >= treatment_year],
+            years_arr[post_periods],
+            Y_treated[post_periods],
+            Y_synthetic[post_periods],
             alpha=0.2, color='#d32f2f'
         )
         ax.set_xlabel('Year', fontsize=11)
@@ -266,7 +304,7 @@ def run_synthetic_control(
 
         # Panel B: Treatment effect over time
         ax2 = axes[1]
-        colors = ['#d32f2f' if e > 0 else '#1976D2' for e in effect]
+        colors = np.where(effect > 0, '#d32f2f', '#1976D2')
         ax2.bar(years, effect, color=colors, alpha=0.8, edgecolor='black', linewidth=0.5)
         ax2.axvline(x=treatment_year - 0.5, color='black', linestyle='--',
                     linewidth=1.5)
@@ -285,7 +323,7 @@ def run_synthetic_control(
 
         plt.tight_layout()
         out_path = output_dir / f"synthetic_control_{treated_state}.png"
-        plt.savefig(out_path, dpi=150, bbox_inches='tight')
+        plt.savefig(out_path, dpi=150, bbox_inches='tight', pil_kwargs={'optimize': True})
         plt.close()
         print(f"  Saved: {out_path}")
 
@@ -311,36 +349,63 @@ def run_synthetic_control(
             f"(RMSPE ratio={rmspe_ratio:.2f}, permutation p={p_value_scm:.3f}). "
             f"Pre-treatment fit RMSPE={rmspe_pre:.3f}pp. "
             f"Synthetic {treated_state} constructed primarily from "
-            f"{', '.join([w['state'] for w in weights_summary[:3]])} "
-            f"(weights: {', '.join([str(w['weight']) for w in weights_summary[:3]])})."
+            f"{top_donor_states} (weights: {top_donor_weights})."
         ),
     }
 
 
-def run_all_case_studies(output_dir: Optional[Path] = None) -> Dict:
+# Primary case studies: name -> (treated state, treatment year)
+CASE_STUDIES = {
+    'Arkansas_2018': ('AR', 2018),
+    'Georgia_2023': ('GA', 2023),
+    'Montana_2019': ('MT', 2019),
+}
+
+
+def run_case_study(name: str, output_dir: Optional[Path] = None) -> Dict:
+    """Run SCM for one entry of CASE_STUDIES; errors are returned, not raised."""
+    state, year = CASE_STUDIES[name]
+    print(f"\nRunning SCM case study: {name}...")
+    try:
+        return run_synthetic_control(
+            treated_state=state,
+            treatment_year=year,
+            output_dir=output_dir,
+        )
+    except Exception as e:
+        print(f"  Error: {e}")
+        return {'error': str(e)}
+
+
+def _run_case_study_captured(name: str, output_dir: Optional[Path]) -> Tuple[Dict, str]:
+    """run_case_study with its progress output buffered; returns (result, log)."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        result = run_case_study(name, output_dir)
+    return result, buf.getvalue()
+
+
+def run_all_case_studies(output_dir: Optional[Path] = None, n_jobs: int = 1) -> Dict:
     """
     Run SCM for all three primary case studies.
-    """
-    case_studies = {
-        'Arkansas_2018': ('AR', 2018),
-        'Georgia_2023': ('GA', 2023),
-        'Montana_2019': ('MT', 2019),
-    }
 
-    results = {}
-    for name, (state, year) in case_studies.items():
-        print(f"\nRunning SCM case study: {name}...")
-        try:
-            results[name] = run_synthetic_control(
-                treated_state=state,
-                treatment_year=year,
-                output_dir=output_dir,
-            )
-        except Exception as e:
-            results[name] = {'error': str(e)}
-            print(f"  Error: {e}")
+    The fits share no state; with n_jobs > 1 they run in worker processes
+    and each study's progress output is printed, in CASE_STUDIES order,
+    once it finishes. Results keep the CASE_STUDIES order either way.
+    """
+    if n_jobs <= 1:
+        return {name: run_case_study(name, output_dir) for name in CASE_STUDIES}
 
-    return results
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(CASE_STUDIES))) as pool:
+        futures = {
+            name: pool.submit(_run_case_study_captured, name, output_dir)
+            for name in CASE_STUDIES
+        }
+        results = {}
+        for name, future in futures.items():
+            results[name], log = future.result()
+            print(log, end='')
+        return results
 
 
 if __name__ == "__main__":
@@ -348,7 +413,7 @@ if __name__ == "__main__":
     output_dir.mkdir(exist_ok=True)
 
     print("Running Synthetic Control Method analyses...")
-    results = run_all_case_studies(output_dir=output_dir)
+    results = run_all_case_studies(output_dir=output_dir, n_jobs=len(CASE_STUDIES))
 
     print("\n=== SYNTHETIC CONTROL RESULTS ===")
     for name, result in results.items():
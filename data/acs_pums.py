@@ -41,7 +41,7 @@ Output:
     3. Regression results: Black-White disability gap conditional on covariates
 """
 
-import io
+import tempfile
 import zipfile
 import requests
 import numpy as np
@@ -51,7 +51,9 @@ from typing import Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-import statsmodels.formula.api as smf
+from scipy import stats as sps
+from scipy.linalg import cho_factor, cho_solve
+from scipy.special import expit
 
 DATA_DIR = Path(__file__).parent
 CACHE_FILE = DATA_DIR / "acs_pums_medicaid_adults.parquet"
@@ -149,17 +151,18 @@ def _download_pums_part(url: str, part_label: str) -> pd.DataFrame:
 
     total = int(resp.headers.get('content-length', 0))
     downloaded = 0
-    chunks = []
+    # Spool to a temp file so the archive is never held in RAM twice
+    buf = tempfile.TemporaryFile()
     for chunk in resp.iter_content(chunk_size=1024 * 1024):
-        chunks.append(chunk)
+        buf.write(chunk)
         downloaded += len(chunk)
         if total:
             pct = downloaded / total * 100
             print(f"\r    {downloaded/1e6:.0f} MB / {total/1e6:.0f} MB ({pct:.0f}%)", end='')
     print()
 
-    raw = b''.join(chunks)
-    zf = zipfile.ZipFile(io.BytesIO(raw))
+    buf.seek(0)
+    zf = zipfile.ZipFile(buf)
 
     # The national zip contains psam_pusa.csv and psam_pusb.csv
     person_files = [n for n in zf.namelist() if n.startswith('psam_p') and n.endswith('.csv')]
@@ -367,6 +370,68 @@ def compute_black_white_gap(prevalence_df: pd.DataFrame) -> pd.DataFrame:
     return gap.sort_values('bw_disability_gap_pp', ascending=False).reset_index(drop=True)
 
 
+def logit_design(df: pd.DataFrame, categorical: list, numeric: list) -> np.ndarray:
+    """
+    Design matrix for the individual-level logits: a constant, 'black',
+    the numeric controls, then drop-first dummies for each categorical
+    (levels in sorted order, as patsy's C() codes them). Dummy columns
+    for levels absent from df are dropped.
+    """
+    design = pd.get_dummies(
+        df[['black'] + numeric + categorical], columns=categorical,
+        drop_first=True, dtype=float,
+    )
+    design = design.loc[:, design.any() | design.columns.isin(['black'] + numeric)]
+    return np.column_stack([np.ones(len(df)), design.to_numpy(dtype=np.float64)])
+
+
+def fit_logit_hc1(X: np.ndarray, y: np.ndarray, max_iter: int = 100, tol: float = 1e-8):
+    """
+    Logistic regression by Newton-IRLS on a design matrix X (constant
+    column included), with heteroskedasticity-robust sandwich standard
+    errors as statsmodels' Logit.fit(cov_type='HC1') reports them (no
+    small-sample factor for MLE models). A Newton step that lowers the
+    log-likelihood is halved until it doesn't.
+
+    Returns (coefficients, standard errors, log-likelihood, fitted p).
+    Raises RuntimeError if the steps have not fallen below tol within
+    max_iter iterations (e.g. under quasi-separation), rather than
+    returning an unconverged fit.
+    """
+    def loglik(eta):
+        return (y * eta - np.logaddexp(0, eta)).sum()
+
+    beta = np.zeros(X.shape[1])
+    eta = X @ beta
+    llf = loglik(eta)
+    converged = False
+    for _ in range(max_iter):
+        p = expit(eta)
+        hessian = (X * (p * (1 - p))[:, None]).T @ X
+        step = cho_solve(cho_factor(hessian), X.T @ (y - p))
+        # Step-halving: never accept a decrease in the log-likelihood
+        for _ in range(30):
+            new_eta = X @ (beta + step)
+            new_llf = loglik(new_eta)
+            if new_llf >= llf - 1e-12 * abs(llf):
+                break
+            step = step / 2
+        else:
+            # No ascent left at floating-point resolution: at the optimum
+            step, new_eta, new_llf = np.zeros_like(step), eta, llf
+        beta, eta, llf = beta + step, new_eta, new_llf
+        if np.abs(step).max() < tol:
+            converged = True
+            break
+    if not converged:
+        raise RuntimeError(f'Logit did not converge in {max_iter} Newton iterations')
+    p = expit(eta)
+    bread = np.linalg.inv((X * (p * (1 - p))[:, None]).T @ X)
+    meat = (X * ((y - p) ** 2)[:, None]).T @ X
+    se = np.sqrt(np.diag(bread @ meat @ bread))
+    return beta, se, llf, p
+
+
 def run_individual_logistic_regression(df: pd.DataFrame) -> dict:
     """
     Logistic regression: P(disability | race, state_FE, age_group, income_cat)
@@ -385,40 +450,34 @@ def run_individual_logistic_regression(df: pd.DataFrame) -> dict:
     if len(model_df) < 1000:
         return {'error': 'Insufficient data for individual-level regression', 'n': len(model_df)}
 
-    # Model 1: race + state FE only
-    formula1 = 'DIS_bin ~ black + C(state)'
-
-    # Model 2: + age + income controls
-    formula2 = 'DIS_bin ~ black + C(state) + C(age_group) + C(income_cat)'
-
-    # Model 3: + education (socioeconomic confounder per Reviewer 3)
-    formula3 = 'DIS_bin ~ black + C(state) + C(age_group) + C(income_cat) + college_plus'
+    y = model_df['DIS_bin'].to_numpy(dtype=np.float64)
+    z_crit = sps.norm.ppf(0.975)
 
     results = {}
-    for name, formula in [
-        ('unadjusted_state_FE', formula1),
-        ('age_income_adjusted', formula2),
-        ('fully_adjusted', formula3),
+    for name, categorical, numeric in [
+        # Model 1: race + state FE only
+        ('unadjusted_state_FE', ['state'], []),
+        # Model 2: + age + income controls
+        ('age_income_adjusted', ['state', 'age_group', 'income_cat'], []),
+        # Model 3: + education (socioeconomic confounder per Reviewer 3)
+        ('fully_adjusted', ['state', 'age_group', 'income_cat'], ['college_plus']),
     ]:
         try:
-            model = smf.logit(formula, data=model_df).fit(
-                cov_type='HC1', disp=False, maxiter=100
-            )
-            # Marginal effect at mean for 'black'
-            me = model.get_margeff()
-            black_idx = [i for i, n in enumerate(me.summary_frame().index) if 'black' in str(n)]
+            X = logit_design(model_df, categorical, numeric)
+            beta, se, llf, p = fit_logit_hc1(X, y)
+            # 'black' is the first column after the constant
+            b, s = float(beta[1]), float(se[1])
 
             results[name] = {
-                'n': int(model.nobs),
-                'aic': round(model.aic, 1),
-                'black_coef_log_odds': round(model.params.get('black', np.nan), 4),
-                'black_or': round(np.exp(model.params.get('black', np.nan)), 3),
-                'black_p_value': round(model.pvalues.get('black', np.nan), 4),
-                'black_ci_lower_or': round(np.exp(model.conf_int().loc['black', 0]), 3) if 'black' in model.conf_int().index else np.nan,
-                'black_ci_upper_or': round(np.exp(model.conf_int().loc['black', 1]), 3) if 'black' in model.conf_int().index else np.nan,
-                'black_marginal_effect_pp': round(
-                    me.margeff[black_idx[0]] * 100, 2
-                ) if black_idx else np.nan,
+                'n': int(len(y)),
+                'aic': round(float(-2 * llf + 2 * X.shape[1]), 1),
+                'black_coef_log_odds': round(b, 4),
+                'black_or': round(float(np.exp(b)), 3),
+                'black_p_value': round(float(2 * sps.norm.sf(abs(b / s))), 4),
+                'black_ci_lower_or': round(float(np.exp(b - z_crit * s)), 3),
+                'black_ci_upper_or': round(float(np.exp(b + z_crit * s)), 3),
+                # Average marginal effect of 'black' (statsmodels' get_margeff default)
+                'black_marginal_effect_pp': round(float((p * (1 - p)).mean() * b * 100), 2),
             }
         except Exception as e:
             results[name] = {'error': str(e), 'n': len(model_df)}
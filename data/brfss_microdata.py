@@ -44,6 +44,8 @@ standard for descriptive analyses.
 """
 
 import io
+import sys
+import tempfile
 import zipfile
 import requests
 import numpy as np
@@ -53,7 +55,10 @@ from typing import Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-import statsmodels.formula.api as smf
+from scipy import stats as sps
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data.acs_pums import logit_design, fit_logit_hc1
 
 DATA_DIR = Path(__file__).parent
 CACHE_FILE = DATA_DIR / "brfss_2022_medicaid_adults.parquet"
@@ -86,6 +91,14 @@ BRFSS_RACE_MAP = {
     9: np.nan,      # Don't know / Not sure / Refused
 }
 
+# INCOME3 code → income band, indexed by code (1-11); slot 0 holds the label
+# for refused/missing/out-of-range codes
+BRFSS_INCOME_LABELS = np.array([
+    'Unknown',
+    '<$15k', '<$15k', '$15-25k', '$15-25k', '$25-50k', '$25-50k',
+    '$50-75k', '>$75k', '>$75k', '>$75k', '>$75k',
+])
+
 
 def _download_brfss() -> pd.DataFrame:
     """Download BRFSS 2022 XPT file and return as DataFrame."""
@@ -97,17 +110,17 @@ def _download_brfss() -> pd.DataFrame:
     resp.raise_for_status()
 
     total = int(resp.headers.get('content-length', 0))
-    chunks = []
+    buf = tempfile.TemporaryFile()
     downloaded = 0
     for chunk in resp.iter_content(chunk_size=512 * 1024):
-        chunks.append(chunk)
+        buf.write(chunk)
         downloaded += len(chunk)
         if total:
             print(f"\r  {downloaded/1e6:.1f} MB / {total/1e6:.1f} MB ({downloaded/total*100:.0f}%)", end='')
     print()
 
-    raw = b''.join(chunks)
-    zf = zipfile.ZipFile(io.BytesIO(raw))
+    buf.seek(0)
+    zf = zipfile.ZipFile(buf)
 
     # Strip whitespace from filenames — CDC zips sometimes include trailing spaces
     xpt_files = [n for n in zf.namelist() if n.strip().upper().endswith('.XPT')]
@@ -249,11 +262,9 @@ def _filter_medicaid_adults(df: pd.DataFrame) -> pd.DataFrame:
     if 'income_code' in df.columns:
         # INCOME3: 1=<$10k, 2=$10-15k, 3=$15-20k, 4=$20-25k, 5=$25-35k,
         #          6=$35-50k, 7=$50-75k, 8=$75-100k, 9=$100-150k, 10=$150-200k, 11=>=200k
-        df['income_cat'] = df['income_code'].map({
-            1: '<$15k', 2: '<$15k', 3: '$15-25k', 4: '$15-25k',
-            5: '$25-50k', 6: '$25-50k', 7: '$50-75k', 8: '>$75k',
-            9: '>$75k', 10: '>$75k', 11: '>$75k',
-        }).fillna('Unknown')
+        code = pd.to_numeric(df['income_code'], errors='coerce').to_numpy(dtype=float)
+        valid = (code >= 1) & (code < len(BRFSS_INCOME_LABELS)) & (code % 1 == 0)
+        df['income_cat'] = BRFSS_INCOME_LABELS[np.where(valid, code, 0).astype(int)]
     else:
         df['income_cat'] = 'Unknown'
 
@@ -337,19 +348,25 @@ def run_brfss_logistic_regression(df: pd.DataFrame) -> dict:
         err = {'error': 'Insufficient BRFSS Medicaid sample for regression', 'n': len(model_df)}
         return {'unadjusted_state_FE': err, 'fully_adjusted': err}
 
+    z_crit = sps.norm.ppf(0.975)
+
     results = {}
-    for name, formula in [
-        ('unadjusted_state_FE', 'any_disability ~ black + C(state)'),
-        ('fully_adjusted', 'any_disability ~ black + C(state) + C(income_cat) + college_plus'),
+    for name, categorical, numeric in [
+        ('unadjusted_state_FE', ['state'], []),
+        ('fully_adjusted', ['state', 'income_cat'], ['college_plus']),
     ]:
         try:
-            model = smf.logit(formula, data=model_df).fit(cov_type='HC1', disp=False, maxiter=100)
+            fit_df = model_df.dropna(subset=categorical + numeric)
+            X = logit_design(fit_df, categorical, numeric)
+            beta, se, _, _ = fit_logit_hc1(X, fit_df['any_disability'].to_numpy(dtype=np.float64))
+            # 'black' is the first column after the constant
+            b, s = float(beta[1]), float(se[1])
             results[name] = {
-                'n': int(model.nobs),
-                'black_or': round(np.exp(model.params.get('black', np.nan)), 3),
-                'black_p_value': round(model.pvalues.get('black', np.nan), 4),
-                'black_ci_lower_or': round(np.exp(model.conf_int().loc['black', 0]), 3) if 'black' in model.conf_int().index else np.nan,
-                'black_ci_upper_or': round(np.exp(model.conf_int().loc['black', 1]), 3) if 'black' in model.conf_int().index else np.nan,
+                'n': int(len(fit_df)),
+                'black_or': round(float(np.exp(b)), 3),
+                'black_p_value': round(float(2 * sps.norm.sf(abs(b / s))), 4),
+                'black_ci_lower_or': round(float(np.exp(b - z_crit * s)), 3),
+                'black_ci_upper_or': round(float(np.exp(b + z_crit * s)), 3),
                 'source': 'BRFSS_2022_individual',
             }
         except Exception as e:
@@ -45,6 +45,7 @@ module is therefore national-level only and used as a sensitivity analysis.
 """
 
 import io
+import tempfile
 import zipfile
 import requests
 import numpy as np
@@ -53,7 +54,7 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
-import statsmodels.formula.api as smf
+from scipy import stats as sps
 
 DATA_DIR = Path(__file__).parent
 CACHE_FILE = DATA_DIR / "meps_2022_medicaid_adults.parquet"
@@ -72,6 +73,11 @@ MEPS_RACE_MAP = {
     5: 'other',
 }
 
+# POVCATyy code → income label, indexed by code (1-5); slot 0 is the fallback
+MEPS_INCOME_LABELS = np.array([
+    'Unknown', 'Poor', 'Near poor', 'Low income', 'Middle income', 'High income',
+])
+
 
 def _download_meps() -> pd.DataFrame:
     """Download MEPS 2022 (h243) Stata .dta file and return as DataFrame.
@@ -87,16 +93,16 @@ def _download_meps() -> pd.DataFrame:
     resp = requests.get(MEPS_DTA_URL, stream=True, timeout=180)
     resp.raise_for_status()
 
-    chunks = []
+    buf = tempfile.TemporaryFile()
     downloaded = 0
     for chunk in resp.iter_content(chunk_size=256 * 1024):
-        chunks.append(chunk)
+        buf.write(chunk)
         downloaded += len(chunk)
         print(f"\r  {downloaded/1e6:.1f} MB downloaded", end='')
     print()
 
-    raw = b''.join(chunks)
-    zf = zipfile.ZipFile(io.BytesIO(raw))
+    buf.seek(0)
+    zf = zipfile.ZipFile(buf)
 
     dta_files = [n for n in zf.namelist() if n.strip().lower().endswith('.dta')]
     if not dta_files:
@@ -173,13 +179,9 @@ def _filter_medicaid_adults(df: pd.DataFrame) -> pd.DataFrame:
     # Poverty category → income label
     if poverty_col:
         df['poverty_cat'] = pd.to_numeric(df[poverty_col], errors='coerce')
-        df['income_cat'] = df['poverty_cat'].map({
-            1: 'Poor',
-            2: 'Near poor',
-            3: 'Low income',
-            4: 'Middle income',
-            5: 'High income',
-        }).fillna('Unknown')
+        code = df['poverty_cat'].to_numpy(dtype=float)
+        valid = (code >= 1) & (code < len(MEPS_INCOME_LABELS)) & (code % 1 == 0)
+        df['income_cat'] = MEPS_INCOME_LABELS[np.where(valid, code, 0).astype(int)]
     else:
         df['income_cat'] = 'Unknown'
 
@@ -296,6 +298,22 @@ def compute_national_race_prevalence(df: pd.DataFrame) -> pd.DataFrame:
     return pd.DataFrame(rows).sort_values('race_eth')
 
 
+def ols_hc1(X: np.ndarray, y: np.ndarray):
+    """
+    OLS on a design matrix X (constant column included) with HC1
+    heteroskedasticity-robust standard errors, as statsmodels'
+    fit(cov_type='HC1'). Returns (coefficients, standard errors, R²).
+    """
+    n = len(y)
+    beta, _, rank, _ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    bread = np.linalg.pinv(X.T @ X)
+    meat = (X * (resid ** 2)[:, None]).T @ X
+    cov = n / (n - rank) * bread @ meat @ bread
+    r_squared = 1 - (resid @ resid) / ((y - y.mean()) ** 2).sum()
+    return beta, np.sqrt(np.diag(cov)), r_squared
+
+
 def run_meps_regression(df: pd.DataFrame) -> dict:
     """
     OLS/logistic regression: P(functional_limitation | black, income, education)
@@ -315,25 +333,36 @@ def run_meps_regression(df: pd.DataFrame) -> dict:
         return {'error': 'Insufficient MEPS sample for regression', 'n': len(model_df)}
 
     results = {}
-    formulas = {
-        'unadjusted': 'any_functional_limitation ~ black',
-        'income_adjusted': 'any_functional_limitation ~ black + C(income_cat)',
-        'fully_adjusted_income_education': (
-            'any_functional_limitation ~ black + C(income_cat) + college_plus'
-        ),
+    # Controls per model; income_cat enters as treatment-coded dummies
+    # (first level alphabetically is the reference, as patsy's C() does)
+    models = {
+        'unadjusted': [],
+        'income_adjusted': ['income_cat'],
+        'fully_adjusted_income_education': ['income_cat', 'college_plus'],
     }
+    z_crit = sps.norm.ppf(0.975)
 
-    for name, formula in formulas.items():
+    for name, controls in models.items():
         try:
             # Use OLS (LPM) for interpretability; coefficients are marginal effects in pp
-            model = smf.ols(formula, data=model_df).fit(cov_type='HC1')
+            fit_df = model_df[['any_functional_limitation', 'black'] + controls].dropna()
+            design = pd.get_dummies(
+                fit_df[['black'] + controls],
+                columns=[c for c in controls if c == 'income_cat'],
+                drop_first=True, dtype=float,
+            )
+            X = np.column_stack([np.ones(len(fit_df)), design.to_numpy(dtype=np.float64)])
+            y = fit_df['any_functional_limitation'].to_numpy(dtype=np.float64)
+            beta, se, r_squared = ols_hc1(X, y)
+            # 'black' is the first column after the constant
+            b, s = float(beta[1]), float(se[1])
             results[name] = {
-                'n': int(model.nobs),
-                'black_coef_pp': round(model.params.get('black', np.nan) * 100, 2),
-                'black_p_value': round(model.pvalues.get('black', np.nan), 4),
-                'black_ci_lower': round(model.conf_int().loc['black', 0] * 100, 2) if 'black' in model.conf_int().index else np.nan,
-                'black_ci_upper': round(model.conf_int().loc['black', 1] * 100, 2) if 'black' in model.conf_int().index else np.nan,
-                'r_squared': round(model.rsquared, 4),
+                'n': int(len(fit_df)),
+                'black_coef_pp': round(b * 100, 2),
+                'black_p_value': round(float(2 * sps.norm.sf(abs(b / s))), 4),
+                'black_ci_lower': round((b - z_crit * s) * 100, 2),
+                'black_ci_upper': round((b + z_crit * s) * 100, 2),
+                'r_squared': round(float(r_squared), 4),
                 'source': 'MEPS_2022_national',
             }
         except Exception as e:
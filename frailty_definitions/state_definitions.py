@@ -6,10 +6,13 @@ Alternative Benefit Plan (ABP) specifications, and CMS guidance as of 2025.
 Sources: CMS, KFF, state SPA submissions, MACPAC reports.
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
+import numpy as np
+
 
 class ExparteDetermination(Enum):
     """Whether state uses ex parte (passive) data to determine frailty."""
@@ -26,6 +29,36 @@ class ClaimsLag(Enum):
     UNKNOWN = "unknown"
 
 
+# Bit positions for the boolean criteria, packed into one uint16 per state.
+FLAG_SMI = 1 << 0
+FLAG_SED = 1 << 1
+FLAG_SUD = 1 << 2
+FLAG_PHYSICAL = 1 << 3
+FLAG_INTELLECTUAL = 1 << 4
+FLAG_DEVELOPMENTAL = 1 << 5
+FLAG_PRIOR_AUTH = 1 << 6
+FLAG_PHYS_CERT = 1 << 7
+FLAG_EHR = 1 << 8
+FLAG_HIE = 1 << 9
+FLAG_MDS = 1 << 10
+FLAG_CFI = 1 << 11
+
+_FLAG_FIELDS = (
+    ("includes_smi", FLAG_SMI),
+    ("includes_sed", FLAG_SED),
+    ("includes_sud", FLAG_SUD),
+    ("includes_physical_disability", FLAG_PHYSICAL),
+    ("includes_intellectual_disability", FLAG_INTELLECTUAL),
+    ("includes_developmental_disability", FLAG_DEVELOPMENTAL),
+    ("requires_prior_auth_record", FLAG_PRIOR_AUTH),
+    ("requires_physician_cert", FLAG_PHYS_CERT),
+    ("uses_ehr_data", FLAG_EHR),
+    ("uses_hie", FLAG_HIE),
+    ("uses_mds_data", FLAG_MDS),
+    ("uses_claims_frailty_index", FLAG_CFI),
+)
+
+
 @dataclass
 class FrailtyDefinition:
     """
@@ -72,6 +105,20 @@ class FrailtyDefinition:
     effective_date: str = ""
     notes: str = ""
 
+    @property
+    def flags(self) -> int:
+        """Boolean criteria packed as a bitmask of FLAG_* constants."""
+        mask = 0
+        for name, bit in _FLAG_FIELDS:
+            if getattr(self, name):
+                mask |= bit
+        return mask
+
+
+def unpack_flags(flags: int) -> Dict[str, bool]:
+    """Expand a FLAG_* bitmask back into the named boolean fields."""
+    return {name: bool(flags & bit) for name, bit in _FLAG_FIELDS}
+
 
 # ---------------------------------------------------------------------------
 # State-level definitions
@@ -673,6 +720,88 @@ STATE_FRAILTY_DEFINITIONS: List[FrailtyDefinition] = [
 STATE_FRAILTY_BY_CODE = {d.state_code: d for d in STATE_FRAILTY_DEFINITIONS}
 
 
+# ---------------------------------------------------------------------------
+# Columnar view
+# One array per attribute, aligned with STATE_FRAILTY_DEFINITIONS order, so
+# summary and export code works on whole columns rather than iterating the
+# dataclass instances (and never goes through dataclasses.asdict).
+# ---------------------------------------------------------------------------
+
+def _float_column(values: List[Optional[float]]) -> np.ndarray:
+    """float32 column with NaN standing in for missing (None) values."""
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+
+# Sorted vocabulary of every ICD-10 family recognized by any state; bit i of
+# the icd10_mask column marks ICD10_FAMILIES[i] (fits in uint32).
+ICD10_FAMILIES: List[str] = sorted(
+    {c for d in STATE_FRAILTY_DEFINITIONS for c in d.recognized_conditions}
+)
+_ICD10_BIT = {c: 1 << i for i, c in enumerate(ICD10_FAMILIES)}
+
+
+def _build_columns(defns: List[FrailtyDefinition]) -> Dict[str, object]:
+    """Build the structure-of-arrays table from a list of definitions."""
+    return {
+        "state_code": [d.state_code for d in defns],
+        "state_name": [d.state_name for d in defns],
+        "adl_threshold": np.array([d.adl_threshold for d in defns], dtype=np.int8),
+        "flags": np.array([d.flags for d in defns], dtype=np.uint16),
+        "n_icd10_families": np.array(
+            [len(d.recognized_conditions) for d in defns], dtype=np.int8
+        ),
+        "icd10_mask": np.array(
+            [sum(_ICD10_BIT[c] for c in set(d.recognized_conditions)) for d in defns],
+            dtype=np.uint32,
+        ),
+        "ex_parte_determination": [d.ex_parte_determination.value for d in defns],
+        "claims_lag": [d.claims_lag.value for d in defns],
+        "est_exempt_pct": _float_column([d.estimated_exempt_pct for d in defns]),
+        "est_black_pct": _float_column([d.estimated_black_exempt_pct for d in defns]),
+        "est_white_pct": _float_column([d.estimated_white_exempt_pct for d in defns]),
+        "est_hispanic_pct": _float_column([d.estimated_hispanic_exempt_pct for d in defns]),
+        "stringency_score": _float_column([d.stringency_score for d in defns]),
+    }
+
+
+_COLS = _build_columns(STATE_FRAILTY_DEFINITIONS)
+
+# Derived exemption gaps (percentage points), NaN where either input is missing
+_COLS["gap_white_black_pp"] = _COLS["est_white_pct"] - _COLS["est_black_pct"]
+_COLS["gap_white_hispanic_pp"] = _COLS["est_white_pct"] - _COLS["est_hispanic_pct"]
+_COLS["gap_overall_black_pp"] = _COLS["est_exempt_pct"] - _COLS["est_black_pct"]
+
+
+def to_json_bytes() -> bytes:
+    """
+    Serialize the state table as columnar JSON: one object of columns rather
+    than a list of row objects. Requires orjson; NumPy columns are written
+    natively without a round-trip through Python lists.
+    """
+    import orjson
+    return orjson.dumps({"columns": _COLS}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def to_arrow():
+    """
+    Return the state table as a pyarrow Table (NaN-coded values become nulls).
+    The ICD-10 vocabulary for decoding icd10_mask is stored in the schema
+    metadata under b"icd10_families".
+    """
+    import json
+    import pyarrow as pa
+    table = pa.table({k: pa.array(v, from_pandas=True) for k, v in _COLS.items()})
+    return table.replace_schema_metadata(
+        {b"icd10_families": json.dumps(ICD10_FAMILIES).encode()}
+    )
+
+
+def to_parquet(path) -> None:
+    """Write the state table to a zstd-compressed Parquet file."""
+    import pyarrow.parquet as pq
+    pq.write_table(to_arrow(), path, compression="zstd")
+
+
 def get_state_definition(state_code: str) -> Optional[FrailtyDefinition]:
     """Return the frailty definition for a given two-letter state code."""
     return STATE_FRAILTY_BY_CODE.get(state_code.upper())
@@ -741,17 +870,24 @@ def compute_stringency_score(defn: FrailtyDefinition) -> float:
 
 
 if __name__ == "__main__":
+    if "--json" in sys.argv[1:]:
+        sys.stdout.buffer.write(to_json_bytes() + b"\n")
+        sys.exit(0)
+
     # Print summary table
+    def _fmt(value: float, spec: str) -> str:
+        return "N/A" if np.isnan(value) else f"{value:{spec}}"
+
+    cols = _COLS
     print(f"{'State':<20} {'Score':>6} {'Exempt%':>8} {'Black%':>8} {'White%':>8} {'Gap':>6}")
     print("-" * 60)
-    for d in sorted(STATE_FRAILTY_DEFINITIONS, key=lambda x: x.stringency_score or 0):
-        gap = ""
-        if d.estimated_black_exempt_pct and d.estimated_white_exempt_pct:
-            gap = f"{d.estimated_white_exempt_pct - d.estimated_black_exempt_pct:.1f}pp"
+    order = np.argsort(np.nan_to_num(cols["stringency_score"]), kind="stable")
+    for i in order:
+        gap = cols["gap_white_black_pp"][i]
         print(
-            f"{d.state_name:<20} {d.stringency_score or 'N/A':>6} "
-            f"{d.estimated_exempt_pct or 'N/A':>8} "
-            f"{d.estimated_black_exempt_pct or 'N/A':>8} "
-            f"{d.estimated_white_exempt_pct or 'N/A':>8} "
-            f"{gap:>6}"
+            f"{cols['state_name'][i]:<20} {_fmt(cols['stringency_score'][i], '.1f'):>6} "
+            f"{_fmt(cols['est_exempt_pct'][i], '.1f'):>8} "
+            f"{_fmt(cols['est_black_pct'][i], '.1f'):>8} "
+            f"{_fmt(cols['est_white_pct'][i], '.1f'):>8} "
+            f"{'' if np.isnan(gap) else f'{gap:.1f}pp':>6}"
         )
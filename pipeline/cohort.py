@@ -27,6 +27,12 @@ from frailty_definitions.state_definitions import (
     STATE_FRAILTY_DEFINITIONS,
     ExparteDetermination,
     ClaimsLag,
+    FLAG_PHYS_CERT,
+    FLAG_PRIOR_AUTH,
+    FLAG_EHR,
+    FLAG_HIE,
+    FLAG_MDS,
+    FLAG_CFI,
 )
 
 # States that have or have proposed OBBBA-relevant work requirements
@@ -50,6 +56,10 @@ WORK_REQUIREMENT_STATES = {
     'FL': (2024, 'pending'),
 }
 
+# Work requirement program statuses ('none' = no program), used as the
+# fixed category set of the wr_status column
+WR_STATUSES = ['none', 'pending', 'active', 'blocked', 'terminated']
+
 # Non-expansion states (no Medicaid expansion as of 2025) — excluded from
 # primary expansion-population analysis but included in supplementary analysis
 NON_EXPANSION_STATES = {'TX', 'FL', 'GA', 'AL', 'MS', 'SC', 'TN', 'WY', 'SD', 'WI'}
@@ -69,41 +79,44 @@ def build_state_policy_index() -> pd.DataFrame:
 
     This serves as the primary policy independent variable in DiD analyses.
     """
-    rows = []
-    for defn in STATE_FRAILTY_DEFINITIONS:
+    defns = STATE_FRAILTY_DEFINITIONS
+    codes = [d.state_code for d in defns]
+
+    # Struct-of-arrays view: one packed flags word and one enum array per
+    # field, so every indicator below is a single vectorized comparison.
+    flags = np.fromiter((d.flags for d in defns), dtype=np.uint16, count=len(defns))
+    ex_parte = np.array([d.ex_parte_determination for d in defns], dtype=object)
+    claims_lag = np.array([d.claims_lag for d in defns], dtype=object)
+    wr_info = [WORK_REQUIREMENT_STATES.get(c, (None, 'none')) for c in codes]
+
+    def _flag(bit):
+        return ((flags & bit) != 0).astype(int)
+
+    df = pd.DataFrame({
+        'state': codes,
+        'state_name': [d.state_name for d in defns],
+        'stringency_score': [d.stringency_score for d in defns],
+        'adl_threshold': [d.adl_threshold for d in defns],
         # Binary indicators for regression
-        full_ex_parte = int(defn.ex_parte_determination == ExparteDetermination.FULL)
-        active_doc = int(defn.ex_parte_determination == ExparteDetermination.ACTIVE)
-        short_lag = int(defn.claims_lag == ClaimsLag.SHORT)
-        long_lag = int(defn.claims_lag == ClaimsLag.LONG)
-        wr_info = WORK_REQUIREMENT_STATES.get(defn.state_code, (None, 'none'))
-
-        rows.append({
-            'state': defn.state_code,
-            'state_name': defn.state_name,
-            'stringency_score': defn.stringency_score,
-            'adl_threshold': defn.adl_threshold,
-            'requires_physician_cert': int(defn.requires_physician_cert),
-            'requires_prior_auth': int(defn.requires_prior_auth_record),
-            'full_ex_parte': full_ex_parte,
-            'active_documentation': active_doc,
-            'short_claims_lag': short_lag,
-            'long_claims_lag': long_lag,
-            'uses_hie': int(defn.uses_hie),
-            'uses_ehr': int(defn.uses_ehr_data),
-            'uses_mds': int(defn.uses_mds_data),
-            'uses_cfi': int(defn.uses_claims_frailty_index),
-            'n_icd10_families': len(defn.recognized_conditions),
-            'wr_year': wr_info[0],
-            'wr_status': wr_info[1],
-            # Estimated exemption outcomes
-            'exempt_pct_overall': defn.estimated_exempt_pct,
-            'exempt_pct_black': defn.estimated_black_exempt_pct,
-            'exempt_pct_white': defn.estimated_white_exempt_pct,
-            'exempt_pct_hispanic': defn.estimated_hispanic_exempt_pct,
-        })
-
-    df = pd.DataFrame(rows)
+        'requires_physician_cert': _flag(FLAG_PHYS_CERT),
+        'requires_prior_auth': _flag(FLAG_PRIOR_AUTH),
+        'full_ex_parte': (ex_parte == ExparteDetermination.FULL).astype(int),
+        'active_documentation': (ex_parte == ExparteDetermination.ACTIVE).astype(int),
+        'short_claims_lag': (claims_lag == ClaimsLag.SHORT).astype(int),
+        'long_claims_lag': (claims_lag == ClaimsLag.LONG).astype(int),
+        'uses_hie': _flag(FLAG_HIE),
+        'uses_ehr': _flag(FLAG_EHR),
+        'uses_mds': _flag(FLAG_MDS),
+        'uses_cfi': _flag(FLAG_CFI),
+        'n_icd10_families': [len(d.recognized_conditions) for d in defns],
+        'wr_year': [w[0] for w in wr_info],
+        'wr_status': pd.Categorical([w[1] for w in wr_info], categories=WR_STATUSES),
+        # Estimated exemption outcomes
+        'exempt_pct_overall': [d.estimated_exempt_pct for d in defns],
+        'exempt_pct_black': [d.estimated_black_exempt_pct for d in defns],
+        'exempt_pct_white': [d.estimated_white_exempt_pct for d in defns],
+        'exempt_pct_hispanic': [d.estimated_hispanic_exempt_pct for d in defns],
+    })
 
     # Compute racial exemption gap (White - Black percentage points)
     df['racial_gap_pp'] = (
@@ -123,7 +136,7 @@ def build_state_cohort() -> pd.DataFrame:
     policy_index = build_state_policy_index()
 
     # Merge on state code
-    cohort = demographics.merge(policy_index, on='state', how='outer')
+    cohort = demographics.merge(policy_index, on='state', how='outer', validate='one_to_one')
 
     # Compute estimated absolute numbers of affected enrollees by race
     # Under OBBBA, the relevant population is adults 19-64 (expansion pop)
@@ -42,19 +42,21 @@ Data sources:
     - MACPAC state-level exemption rate estimates (2024 report)
 """
 
+import functools
+import importlib
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 import sys
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-import statsmodels.formula.api as smf
-import statsmodels.api as sm
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import cross_val_score
+from scipy import stats as sps
+from scipy.stats import rankdata
+from scipy.linalg import solve_triangular
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from pipeline.cohort import build_state_cohort
@@ -64,6 +66,66 @@ from pipeline.cohort import build_state_cohort
 # Individual-level need-side data integration
 # ---------------------------------------------------------------------------
 
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+@dataclass(frozen=True)
+class SurveySource:
+    """One individual-level survey: its parquet cache and data/ module entry points."""
+    key: str            # prefix of the result keys ('acs' → 'acs', 'acs_regression')
+    name: str           # short name for console messages
+    description: str
+    role: str           # PRIMARY / SECONDARY / TERTIARY
+    module: str
+    load: str
+    prevalence: str
+    regression: str
+    cache: Path
+    gap: Optional[str] = None
+
+
+INDIVIDUAL_SOURCES = (
+    SurveySource(
+        'acs', 'ACS PUMS', 'ACS PUMS individual-level data', 'PRIMARY', 'data.acs_pums',
+        'load_medicaid_adults', 'compute_state_race_prevalence',
+        'run_individual_logistic_regression',
+        DATA_DIR / 'acs_pums_medicaid_adults.parquet', gap='compute_black_white_gap',
+    ),
+    SurveySource(
+        'brfss', 'BRFSS', 'BRFSS individual microdata', 'SECONDARY', 'data.brfss_microdata',
+        'load_brfss_medicaid_adults', 'compute_state_race_prevalence',
+        'run_brfss_logistic_regression',
+        DATA_DIR / 'brfss_2022_medicaid_adults.parquet',
+    ),
+    SurveySource(
+        'meps', 'MEPS', 'MEPS functional limitations', 'TERTIARY', 'data.meps_functional',
+        'load_meps_medicaid_adults', 'compute_national_race_prevalence',
+        'run_meps_regression',
+        DATA_DIR / 'meps_2022_medicaid_adults.parquet',
+    ),
+)
+
+
+def _load_survey(source: SurveySource) -> Dict:
+    """Load one survey's cache and run its prevalence and regression steps."""
+    results = {}
+    try:
+        module = importlib.import_module(source.module)
+        if source.cache.exists():
+            df = getattr(module, source.load)()
+            results[source.key] = getattr(module, source.prevalence)(df)
+            if source.gap:
+                results[f'{source.key}_gap'] = getattr(module, source.gap)(results[source.key])
+            results[f'{source.key}_regression'] = getattr(module, source.regression)(df)
+            print(f"  [OK] {source.description} loaded ({source.role})")
+        else:
+            script = source.module.replace('.', '/') + '.py'
+            print(f"  [SKIP] {source.name} cache not found — run {script} to download")
+    except Exception as e:
+        print(f"  [WARN] {source.name} load failed: {e}")
+    return results
+
+
 def load_individual_level_disability(
     prefer_acs: bool = True,
     load_brfss: bool = True,
@@ -81,68 +143,58 @@ def load_individual_level_disability(
 
     The ACS prevalence table is the PRIMARY source for need-side estimates.
     BRFSS individual-level is SECONDARY. MEPS is TERTIARY (national only).
+
+    Results are memoized per argument combination and are recomputed only
+    when a survey cache file is created, replaced or removed. Each call
+    returns a fresh dict; the DataFrames inside are shared and must not be
+    modified in place.
+    """
+    cache_stamps = tuple(
+        source.cache.stat().st_mtime_ns if source.cache.exists() else None
+        for source in INDIVIDUAL_SOURCES
+    )
+    return dict(_load_individual_level_disability(prefer_acs, load_brfss, load_meps, cache_stamps))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_individual_level_disability(
+    prefer_acs: bool,
+    load_brfss: bool,
+    load_meps: bool,
+    cache_stamps: Tuple,
+) -> Dict:
+    """
+    Uncached loader; cache_stamps only keys the lru_cache. The surveys are
+    independent (parquet decode plus regressions), so they load in threads.
     """
     results = {'acs': None, 'brfss': None, 'meps': None,
                'acs_regression': None, 'brfss_regression': None,
                'meps_regression': None}
 
-    if prefer_acs:
-        try:
-            from data.acs_pums import (
-                load_medicaid_adults as acs_load,
-                compute_state_race_prevalence as acs_prev,
-                compute_black_white_gap as acs_gap,
-                run_individual_logistic_regression as acs_reg,
-            )
-            cache = Path(__file__).parent.parent / 'data' / 'acs_pums_medicaid_adults.parquet'
-            if cache.exists():
-                df = acs_load()
-                results['acs'] = acs_prev(df)
-                results['acs_gap'] = acs_gap(results['acs'])
-                results['acs_regression'] = acs_reg(df)
-                print("  [OK] ACS PUMS individual-level data loaded (PRIMARY)")
-            else:
-                print("  [SKIP] ACS PUMS cache not found — run data/acs_pums.py to download")
-        except Exception as e:
-            print(f"  [WARN] ACS PUMS load failed: {e}")
+    wanted = {'acs': prefer_acs, 'brfss': load_brfss, 'meps': load_meps}
+    sources = [source for source in INDIVIDUAL_SOURCES if wanted[source.key]]
+    if sources:
+        with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+            for loaded in pool.map(_load_survey, sources):
+                results.update(loaded)
 
-    if load_brfss:
-        try:
-            from data.brfss_microdata import (
-                load_brfss_medicaid_adults as brfss_load,
-                compute_state_race_prevalence as brfss_prev,
-                run_brfss_logistic_regression as brfss_reg,
-            )
-            cache = Path(__file__).parent.parent / 'data' / 'brfss_2022_medicaid_adults.parquet'
-            if cache.exists():
-                df = brfss_load()
-                results['brfss'] = brfss_prev(df)
-                results['brfss_regression'] = brfss_reg(df)
-                print("  [OK] BRFSS individual microdata loaded (SECONDARY)")
-            else:
-                print("  [SKIP] BRFSS cache not found — run data/brfss_microdata.py to download")
-        except Exception as e:
-            print(f"  [WARN] BRFSS load failed: {e}")
+    return results
 
-    if load_meps:
-        try:
-            from data.meps_functional import (
-                load_meps_medicaid_adults as meps_load,
-                compute_national_race_prevalence as meps_prev,
-                run_meps_regression as meps_reg,
-            )
-            cache = Path(__file__).parent.parent / 'data' / 'meps_2022_medicaid_adults.parquet'
-            if cache.exists():
-                df = meps_load()
-                results['meps'] = meps_prev(df)
-                results['meps_regression'] = meps_reg(df)
-                print("  [OK] MEPS functional limitations loaded (TERTIARY)")
-            else:
-                print("  [SKIP] MEPS cache not found — run data/meps_functional.py to download")
-        except Exception as e:
-            print(f"  [WARN] MEPS load failed: {e}")
 
-    return results
+def _black_white_wide(prev: pd.DataFrame, values: List[str], source: str) -> pd.DataFrame:
+    """
+    Pivot a state × race prevalence table to one row per state with
+    '<measure>_<race>_<source>' columns for Black and White adults,
+    e.g. disability_pct → disability_black_acs.
+    """
+    races = ['black', 'white']
+    wide = (
+        prev[prev['race_eth'].isin(races)]
+        .pivot(index='state', columns='race_eth', values=values)
+        .reindex(columns=pd.MultiIndex.from_product([values, races]))
+    )
+    wide.columns = [f"{v.replace('_pct', '')}_{race}_{source}" for v, race in wide.columns]
+    return wide.reset_index()
 
 
 def merge_individual_level_into_cohort(
@@ -166,61 +218,66 @@ def merge_individual_level_into_cohort(
         disability_white        — Best available (ACS > BRFSS > ecological)
         need_data_source        — Which source was used for primary estimate
     """
-    df = cohort.copy()
+    # Merges and the final concat return new frames; the caller's is never modified
+    df = cohort
 
     # ACS primary
     if individual_data.get('acs') is not None:
-        acs = individual_data['acs']
-        for race_eth, col_suffix in [('black', 'black_acs'), ('white', 'white_acs')]:
-            race_df = acs[acs['race_eth'] == race_eth].set_index('state')
-            df[f'disability_{col_suffix}'] = df['state'].map(
-                race_df['disability_pct']
-            )
-            df[f'adl_iadl_{col_suffix}'] = df['state'].map(
-                race_df['adl_iadl_pct']
-            )
+        acs_wide = _black_white_wide(
+            individual_data['acs'], ['disability_pct', 'adl_iadl_pct'], 'acs'
+        )
+        # States outside the cohort's categories would become NaN keys and
+        # break validate='many_to_one'; the left join drops them anyway
+        acs_wide = acs_wide[acs_wide['state'].isin(df['state'].cat.categories)]
+        acs_wide = acs_wide.astype({'state': df['state'].dtype})
+        df = df.merge(acs_wide, on='state', how='left', validate='many_to_one')
 
     # BRFSS secondary
     if individual_data.get('brfss') is not None:
-        brfss = individual_data['brfss']
-        for race_eth, col_suffix in [('black', 'black_brfss'), ('white', 'white_brfss')]:
-            race_df = brfss[brfss['race_eth'] == race_eth].set_index('state')
-            df[f'disability_{col_suffix}'] = df['state'].map(
-                race_df['disability_pct']
-            )
+        brfss_wide = _black_white_wide(individual_data['brfss'], ['disability_pct'], 'brfss')
+        brfss_wide = brfss_wide[brfss_wide['state'].isin(df['state'].cat.categories)]
+        brfss_wide = brfss_wide.astype({'state': df['state'].dtype})
+        df = df.merge(brfss_wide, on='state', how='left', validate='many_to_one')
+
+    # Derived columns are collected here and attached with a single concat
+    new_cols = {}
 
     # Best available: ACS > BRFSS > ecological fallback
+    missing = np.full(len(df), np.nan)
+
+    def _values(col):
+        return df[col].to_numpy(dtype=np.float64) if col in df.columns else missing
+
     for race in ['black', 'white']:
         acs_col = f'disability_{race}_acs'
         brfss_col = f'disability_{race}_brfss'
         eco_col = f'disability_{race}'    # from build_disparity_dataset ecological merge
 
-        if acs_col in df.columns:
-            df[f'disability_{race}_best'] = df[acs_col].fillna(
-                df.get(brfss_col, pd.Series(np.nan, index=df.index))
-            ).fillna(df.get(eco_col, pd.Series(np.nan, index=df.index)))
-        elif brfss_col in df.columns:
-            df[f'disability_{race}_best'] = df[brfss_col].fillna(
-                df.get(eco_col, pd.Series(np.nan, index=df.index))
+        if acs_col in df.columns or brfss_col in df.columns:
+            acs, brfss, eco = _values(acs_col), _values(brfss_col), _values(eco_col)
+            new_cols[f'disability_{race}_best'] = np.where(
+                ~np.isnan(acs), acs, np.where(~np.isnan(brfss), brfss, eco)
             )
 
     # Tag data source used
-    def _source(row):
-        if 'disability_black_acs' in row and pd.notna(row.get('disability_black_acs')):
-            return 'ACS_individual'
-        elif 'disability_black_brfss' in row and pd.notna(row.get('disability_black_brfss')):
-            return 'BRFSS_individual'
-        return 'BRFSS_ecological'
-
-    df['need_data_source'] = df.apply(_source, axis=1)
+    has_acs = 'disability_black_acs' in df.columns
+    has_brfss = 'disability_black_brfss' in df.columns
+    no_rows = np.zeros(len(df), dtype=bool)
+    acs_mask = ~np.isnan(_values('disability_black_acs')) if has_acs else no_rows
+    brfss_mask = ~np.isnan(_values('disability_black_brfss')) if has_brfss else no_rows
+    new_cols['need_data_source'] = np.select(
+        [acs_mask, brfss_mask],
+        ['ACS_individual', 'BRFSS_individual'],
+        default='BRFSS_ecological',
+    )
 
     # Recompute Black-White gap using best available estimates
-    if 'disability_black_best' in df.columns and 'disability_white_best' in df.columns:
-        df['disability_gap_black_white_best'] = (
-            df['disability_black_best'] - df['disability_white_best']
+    if 'disability_black_best' in new_cols and 'disability_white_best' in new_cols:
+        new_cols['disability_gap_black_white_best'] = (
+            new_cols['disability_black_best'] - new_cols['disability_white_best']
         )
 
-    return df
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
 
 
 # ---------------------------------------------------------------------------
@@ -286,6 +343,34 @@ BRFSS_DISABILITY = {
     'WY': dict(overall=29.4, black=36.1, white=28.8, hispanic=22.4),
 }
 
+# The same table as a state-keyed frame, built once for the cohort merge
+BRFSS_DISABILITY_DF = pd.DataFrame({
+    'state': list(BRFSS_DISABILITY),
+    **{
+        f'disability_{group}': [vals[group] for vals in BRFSS_DISABILITY.values()]
+        for group in ('overall', 'black', 'white', 'hispanic')
+    },
+})
+
+
+def pct_rank(values: pd.Series) -> np.ndarray:
+    """
+    Percentile rank (average rank for ties, divided by the number of
+    non-missing values) with NaN kept in place; same as
+    Series.rank(pct=True).
+    """
+    vals = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    mask = ~np.isnan(vals)
+    ranks = np.full_like(vals, np.nan)
+    ranks[mask] = rankdata(vals[mask]) / mask.sum()
+    return ranks
+
+
+@functools.lru_cache(maxsize=1)
+def _state_cohort() -> pd.DataFrame:
+    """build_state_cohort(), built once per process."""
+    return build_state_cohort()
+
 
 def build_disparity_dataset(
     intensity_df: pd.DataFrame = None,
@@ -308,21 +393,21 @@ def build_disparity_dataset(
     use_individual_level : if True, attempt to load ACS/BRFSS individual data
                            and merge over the ecological fallback estimates
     """
-    cohort = build_state_cohort()
+    # Copy so the column casts below never touch the memoized cohort
+    cohort = _state_cohort().copy()
+
+    # Every state-keyed join below runs on the integer codes of one shared
+    # categorical dtype instead of hashing state-code strings
+    state_dtype = pd.CategoricalDtype(sorted(cohort['state'].dropna().unique()))
+    cohort['state'] = cohort['state'].astype(state_dtype)
 
     # --- Ecological fallback: BRFSS state×race aggregates ---
     # Retained for backward compatibility and cells with inadequate individual n
-    brfss_rows = []
-    for state, vals in BRFSS_DISABILITY.items():
-        brfss_rows.append({
-            'state': state,
-            'disability_overall': vals['overall'],
-            'disability_black': vals['black'],
-            'disability_white': vals['white'],
-            'disability_hispanic': vals['hispanic'],
-        })
-    brfss_df = pd.DataFrame(brfss_rows)
-    df = cohort.merge(brfss_df, on='state', how='left')
+    brfss_eco = BRFSS_DISABILITY_DF[BRFSS_DISABILITY_DF['state'].isin(state_dtype.categories)]
+    df = cohort.merge(
+        brfss_eco.astype({'state': state_dtype}),
+        on='state', how='left', validate='many_to_one',
+    )
 
     # --- Attempt individual-level overlay (PRIMARY/SECONDARY) ---
     if use_individual_level:
@@ -340,12 +425,14 @@ def build_disparity_dataset(
 
     # --- Provider intensity ---
     if intensity_df is not None:
-        intensity_agg = intensity_df.groupby('state').agg(
+        intensity_agg = intensity_df.astype({'state': state_dtype}).groupby(
+            'state', observed=True
+        ).agg(
             intensity_per_enrollee=('intensity_per_enrollee', 'mean'),
             provider_density_per_1k=('provider_density_per_1k', 'mean'),
             t1019_coverage_pct=('t1019_coverage_pct', 'mean'),
         ).reset_index()
-        df = df.merge(intensity_agg, on='state', how='left')
+        df = df.merge(intensity_agg, on='state', how='left', validate='many_to_one')
     else:
         df['intensity_per_enrollee'] = np.nan
         df['provider_density_per_1k'] = np.nan
@@ -355,9 +442,9 @@ def build_disparity_dataset(
 
     # --- Label bias: cost-proxy rank vs. true-need rank ---
     if df['intensity_per_enrollee'].notna().any():
-        df['cost_proxy_rank'] = df['intensity_per_enrollee'].rank(pct=True)
+        df['cost_proxy_rank'] = pct_rank(df['intensity_per_enrollee'])
     else:
-        df['cost_proxy_rank'] = df['exempt_pct_overall'].rank(pct=True)
+        df['cost_proxy_rank'] = pct_rank(df['exempt_pct_overall'])
 
     # Use best-available disability estimate for true-need ranking
     need_col = 'disability_overall'  # ecological fallback
@@ -370,7 +457,7 @@ def build_disparity_dataset(
         if df['disability_overall_best'].notna().sum() >= 10:
             need_col = 'disability_overall_best'
 
-    df['true_need_rank'] = df[need_col].rank(pct=True)
+    df['true_need_rank'] = pct_rank(df[need_col])
     df['label_bias_score'] = df['cost_proxy_rank'] - df['true_need_rank']
 
     # --- Disability gap: use best available ---
@@ -386,9 +473,95 @@ def build_disparity_dataset(
     # --- Algorithmic penalty ---
     df['algorithmic_penalty'] = df['disability_gap_black_white'] - df['racial_gap_pp'].fillna(0)
 
+    return compact_dtypes(df)
+
+
+# Low-cardinality label columns stored as pandas categoricals
+CATEGORICAL_COLS = ['wr_status', 'need_data_source']
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Losslessly shrink the analysis frame before it is cached or shipped to
+    worker processes: integer columns are downcast to the smallest integer
+    type that holds their values, and CATEGORICAL_COLS become categoricals.
+
+    Float columns are left as float64 so regression estimates are unchanged.
+    """
+    for col in df.select_dtypes(include=['integer']).columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
     return df
 
 
+# Model 1 regressors (policy drivers); model 2 adds the demographic controls
+POLICY_PREDICTORS = [
+    'stringency_score', 'requires_physician_cert', 'full_ex_parte',
+    'uses_hie', 'uses_cfi', 'long_claims_lag',
+]
+DEMOGRAPHIC_CONTROLS = ['black_pct', 'disability_gap_black_white']
+
+
+def fit_ols(
+    X: np.ndarray,
+    y: np.ndarray,
+    names: List[str],
+    qr: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Dict:
+    """
+    Classical OLS on a design matrix X (constant column included) solved
+    through its QR factorization, returning n, R², adjusted R², AIC/BIC and
+    per-coefficient estimates, SEs, t-test p-values and 95% CIs.
+
+    qr may pass in an existing (Q, R) factorization of X, e.g. the leading
+    column block of a larger nested model's factorization.
+
+    A collinear design falls back to the minimum-norm (pseudo-inverse)
+    solution, matching statsmodels.
+    """
+    n, k = X.shape
+    Q, R = np.linalg.qr(X) if qr is None else qr
+    diag_r = np.abs(np.diag(R))
+    rank = int((diag_r > 1e-10 * diag_r.max()).sum())
+    if rank == k:
+        beta = solve_triangular(R, Q.T @ y)
+        R_inv = solve_triangular(R, np.eye(k))
+        cov_unscaled = R_inv @ R_inv.T
+    else:
+        beta = np.linalg.lstsq(X, y, rcond=None)[0]
+        cov_unscaled = np.linalg.pinv(X.T @ X)
+
+    resid = y - X @ beta
+    ssr = resid @ resid
+    df_resid = n - rank
+    se = np.sqrt(ssr / df_resid * np.diag(cov_unscaled))
+    p_values = 2 * sps.t.sf(np.abs(beta / se), df_resid)
+    half_width = sps.t.ppf(0.975, df_resid) * se
+
+    r_squared = 1 - ssr / ((y - y.mean()) ** 2).sum()
+    llf = -n / 2 * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+
+    return {
+        'n': int(n),
+        'r_squared': round(float(r_squared), 3),
+        'adj_r_squared': round(float(1 - (n - 1) / df_resid * (1 - r_squared)), 3),
+        'coefficients': {
+            var: {
+                'coef': round(float(beta[i]), 4),
+                'se': round(float(se[i]), 4),
+                'p_value': round(float(p_values[i]), 4),
+                'ci_lower': round(float(beta[i] - half_width[i]), 4),
+                'ci_upper': round(float(beta[i] + half_width[i]), 4),
+            }
+            for i, var in enumerate(names)
+        },
+        'aic': round(float(-2 * llf + 2 * rank), 2),
+        'bic': round(float(-2 * llf + np.log(n) * rank), 2),
+    }
+
+
 def run_ols_disparity_regression(df: pd.DataFrame) -> Dict:
     """
     OLS regression: racial_gap_pp ~ policy_drivers + controls
@@ -396,45 +569,42 @@ def run_ols_disparity_regression(df: pd.DataFrame) -> Dict:
     Key hypothesis: higher stringency, active documentation, and lack of
     HIE/EHR integration predict larger racial gaps in exemption rates.
     """
-    model_df = df.dropna(subset=['racial_gap_pp', 'stringency_score']).copy()
+    model_df = df.dropna(subset=['racial_gap_pp', 'stringency_score'])
 
     if len(model_df) < 10:
         return {'error': 'Insufficient data for regression', 'n': len(model_df)}
 
-    # Model 1: Policy drivers only
-    formula1 = (
-        'racial_gap_pp ~ stringency_score + requires_physician_cert + '
-        'full_ex_parte + uses_hie + uses_cfi + long_claims_lag'
-    )
+    # One float matrix for the outcome and every regressor of the larger
+    # model; each model takes its columns from it
+    columns = ['racial_gap_pp'] + POLICY_PREDICTORS + DEMOGRAPHIC_CONTROLS
+    data = model_df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
 
-    # Model 2: Add demographic controls
-    formula2 = (
-        'racial_gap_pp ~ stringency_score + requires_physician_cert + '
-        'full_ex_parte + uses_hie + uses_cfi + long_claims_lag + '
-        'black_pct + disability_gap_black_white'
-    )
+    # Factor the larger model's design once. Since X = QR with R upper
+    # triangular, the first k columns of X factor as Q[:, :k] R[:k, :k], so
+    # a nested model fitted on the same rows reuses that factorization.
+    keep_full = ~np.isnan(data).any(axis=1)
+    X_full = np.column_stack([np.ones(keep_full.sum()), data[keep_full, 1:]])
+    y_full = data[keep_full, 0]
+    qr_full = np.linalg.qr(X_full) if len(y_full) >= X_full.shape[1] else None
 
     results = {}
-    for name, formula in [('policy_only', formula1), ('with_demographics', formula2)]:
+    for name, predictors in [
+        ('policy_only', POLICY_PREDICTORS),
+        ('with_demographics', POLICY_PREDICTORS + DEMOGRAPHIC_CONTROLS),
+    ]:
         try:
-            model = smf.ols(formula, data=model_df).fit()
+            k = 1 + len(predictors)
+            # Listwise deletion on each model's own columns
+            keep = ~np.isnan(data[:, :k]).any(axis=1)
+            if qr_full is not None and np.array_equal(keep, keep_full):
+                Q, R = qr_full
+                X, y, qr = X_full[:, :k], y_full, (Q[:, :k], R[:k, :k])
+            else:
+                sub = data[keep, :k]
+                X, y, qr = np.column_stack([np.ones(len(sub)), sub[:, 1:]]), sub[:, 0], None
             results[name] = {
-                'formula': formula,
-                'n': int(model.nobs),
-                'r_squared': round(model.rsquared, 3),
-                'adj_r_squared': round(model.rsquared_adj, 3),
-                'coefficients': {
-                    var: {
-                        'coef': round(model.params[var], 4),
-                        'se': round(model.bse[var], 4),
-                        'p_value': round(model.pvalues[var], 4),
-                        'ci_lower': round(model.conf_int().loc[var, 0], 4),
-                        'ci_upper': round(model.conf_int().loc[var, 1], 4),
-                    }
-                    for var in model.params.index
-                },
-                'aic': round(model.aic, 2),
-                'bic': round(model.bic, 2),
+                'formula': 'racial_gap_pp ~ ' + ' + '.join(predictors),
+                **fit_ols(X, y, ['Intercept'] + predictors, qr=qr),
             }
         except Exception as e:
             results[name] = {'error': str(e)}
@@ -442,6 +612,15 @@ def run_ols_disparity_regression(df: pd.DataFrame) -> Dict:
     return results
 
 
+def significance_stars(p_values) -> np.ndarray:
+    """
+    Conventional significance markers for an array of p-values:
+    *** p<0.01, ** p<0.05, * p<0.10, '' otherwise.
+    """
+    p = np.asarray(p_values, dtype=float)
+    return np.select([p < 0.01, p < 0.05, p < 0.10], ['***', '**', '*'], default='')
+
+
 def run_coverage_loss_disparity(df: pd.DataFrame) -> pd.DataFrame:
     """
     Quantify the absolute coverage loss disparity by race.
@@ -452,24 +631,17 @@ def run_coverage_loss_disparity(df: pd.DataFrame) -> pd.DataFrame:
 
     This is the policy-relevant output for policymakers.
     """
-    wr_states = df[df['wr_status'].isin(['active', 'pending', 'blocked'])].copy()
-    wr_states = wr_states.dropna(subset=['expansion_pop_est'])
-
-    # Expected coverage losses if exemption system worked perfectly (no bias)
-    # = expansion_pop * disability_rate * (1 - exemption_threshold)
-    # Use 15% as target exemption threshold (federal regulatory floor)
-    TARGET_EXEMPT_PCT = 15.0
-
-    wr_states['fair_exempt_black'] = wr_states['disability_black'] / 100 * TARGET_EXEMPT_PCT
-    wr_states['fair_exempt_white'] = wr_states['disability_white'] / 100 * TARGET_EXEMPT_PCT
-
-    # Actual exemption gap
-    wr_states['actual_gap'] = wr_states['racial_gap_pp'].fillna(0)
+    in_scope = (
+        df['wr_status'].isin(['active', 'pending', 'blocked'])
+        & df['expansion_pop_est'].notna()
+    )
+    wr_states = df[in_scope].copy()
 
-    # Excess coverage losses for Black enrollees
-    wr_states['excess_loss_black'] = (
-        wr_states['actual_gap'] / 100 * wr_states['black_expansion_est']
-    ).round()
+    # Excess coverage losses for Black enrollees: the actual exemption gap
+    # (missing gaps count as zero) applied to the Black expansion population
+    actual_gap = np.nan_to_num(wr_states['racial_gap_pp'].to_numpy(dtype=np.float64, na_value=np.nan))
+    black_expansion = wr_states['black_expansion_est'].to_numpy(dtype=np.float64, na_value=np.nan)
+    wr_states['excess_loss_black'] = np.round(actual_gap / 100 * black_expansion)
 
     return wr_states[[
         'state', 'state_name', 'wr_status', 'stringency_score',
@@ -498,10 +670,11 @@ if __name__ == "__main__":
     for model_name, result in reg_results.items():
         if 'error' not in result:
             print(f"\n  {model_name}: R²={result['r_squared']}, n={result['n']}")
-            for var, stats in result['coefficients'].items():
-                if var != 'Intercept':
-                    sig = '***' if stats['p_value'] < 0.01 else ('**' if stats['p_value'] < 0.05 else ('*' if stats['p_value'] < 0.10 else ''))
-                    print(f"    {var}: β={stats['coef']:.3f} (SE={stats['se']:.3f}) p={stats['p_value']:.3f} {sig}")
+            coef_df = pd.DataFrame.from_dict(result['coefficients'], orient='index').drop(
+                index='Intercept', errors='ignore'
+            )[['coef', 'se', 'p_value']]
+            coef_df['sig'] = significance_stars(coef_df['p_value'])
+            print(coef_df.to_markdown(floatfmt='.3f'))
 
     print("\n\nCoverage Loss Disparity by State:")
     loss_df = run_coverage_loss_disparity(df)
@@ -87,7 +87,7 @@ def compute_state_intensity(t1019_df: pd.DataFrame,
                               'black_pct', 'white_pct', 'hispanic_pct',
                               'stringency_score', 'racial_gap_pp',
                               'full_ex_parte', 'uses_hie', 'uses_cfi']].copy()
-    annual = annual.merge(cohort_sub, on='state', how='left')
+    annual = annual.merge(cohort_sub, on='state', how='left', validate='many_to_one')
 
     # Provider intensity: T1019 spending per expansion enrollee
     annual['intensity_per_enrollee'] = (
@@ -163,7 +163,7 @@ def compute_hotspot_geography(t1019_df: pd.DataFrame,
         total_beneficiaries=('beneficiaries', 'sum')
     ).reset_index()
 
-    result = annual.merge(hotspot_pct, on='state', how='left')
+    result = annual.merge(hotspot_pct, on='state', how='left', validate='one_to_one')
     result['is_hotspot_state'] = result['state'].isin(hotspot_states)
     result['hotspot_provider_share'] = result['hotspot_provider_share'].fillna(0)
 
@@ -200,7 +200,7 @@ def run_provider_intensity_analysis(
     # Merge hotspot data
     result = intensity_df.merge(
         hotspot_df[['state', 'hotspot_provider_share', 'is_hotspot_state']],
-        on='state', how='left'
+        on='state', how='left', validate='many_to_one'
     )
 
     # Focus on 2022-2024 (post-ACA expansion stabilization, pre-OBBBA)
@@ -16,122 +16,278 @@ Master pipeline that runs the full reconceptualized analysis:
 
 Outputs:
     output/improved_algorithm_results.json  — Primary results
+    output/improved_algorithm_results.json.gz — Compressed copy for archival (git-ignored)
     output/g2211_validation_results.json    — G2211 validation
     output/tables/                          — CSV tables for exhibits
+    output/.cache/                          — Memoized step results (safe to delete)
+
+Usage:
+    python run_reconceptualized_pipeline.py [--force]
+
+    --force   ignore output/.cache and recompute every step (sets PIPELINE_FORCE=1,
+              which worker processes inherit)
 """
 
-import json
+import contextlib
+import functools
+import gzip
+import hashlib
+import io
+import os
+import pickle
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Ensure project root is on path
 ROOT = Path(__file__).parent
 sys.path.insert(0, str(ROOT))
 
-def main():
-    print("=" * 70)
-    print("RECONCEPTUALIZED PIPELINE: Improved Frailty Algorithm Analysis")
-    print("=" * 70)
+OUTPUT_DIR = ROOT / 'output'
+TABLES_DIR = OUTPUT_DIR / 'tables'
+CACHE_DIR = OUTPUT_DIR / '.cache'
+RESULTS_PATH = OUTPUT_DIR / 'improved_algorithm_results.json'
+G2211_RESULTS_PATH = OUTPUT_DIR / 'g2211_validation_results.json'
+PACKAGE_DIRS = ['bias_analysis', 'causal_inference', 'data', 'frailty_definitions', 'pipeline']
 
-    # --- Step 1: Run improved algorithm analysis ---
-    print("\n\n[1/5] Running improved algorithm analysis...")
-    from bias_analysis.improved_algorithm import run_full_improved_analysis
-    results = run_full_improved_analysis(n_sim=300, sample_n=2000)
 
-    # Save primary results
-    output_dir = ROOT / 'output'
-    output_dir.mkdir(exist_ok=True)
-    tables_dir = output_dir / 'tables'
-    tables_dir.mkdir(exist_ok=True)
+# Console summary; placeholders are keys of results['summary']
+SUMMARY_TEMPLATE = """
+{rule}
+FINAL SUMMARY
+{rule}
+  States analyzed:              {n_states}
+  ACS individuals:              {n_acs_individuals:,}
+  Status quo sensitivity:       {mean_sq_overall_sensitivity:.1f}%
+  Improved sensitivity:         {mean_imp_overall_sensitivity:.1f}%
+  Sensitivity gain:             +{mean_sensitivity_gain_pp:.1f}pp
+  B-W gap (status quo):         {mean_sq_bw_gap_pp:.1f}pp
+  B-W gap (improved):           {mean_imp_bw_gap_pp:.1f}pp
+  Gap reduction:                {mean_gap_reduction_pp:.1f}pp ({mean_gap_reduction_pct:.0f}%)
+  Additional frail identified:  {total_additional_identified:,}
+  Coverage losses averted:      {total_coverage_losses_averted:,}""".replace('{rule}', '=' * 70)
 
-    with open(output_dir / 'improved_algorithm_results.json', 'w') as f:
-        json.dump(results, f, indent=2, default=str)
-    print(f"  Saved: {output_dir / 'improved_algorithm_results.json'}")
 
-    # --- Step 2: Generate comparison table CSV ---
-    print("\n\n[2/5] Generating exhibit tables...")
+def _inputs_digest() -> str:
+    """
+    Hash every package source file and every input parquet under data/.
+
+    Any edit to the analysis code or a refreshed data extract changes the
+    digest, which invalidates all cached step results at once.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for pkg in PACKAGE_DIRS:
+        for path in sorted((ROOT / pkg).glob('*.py')) + sorted((ROOT / pkg).glob('*.parquet')):
+            h.update(str(path.relative_to(ROOT)).encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _arg_digest(h, value) -> None:
+    """Feed one call argument into the cache key (DataFrames by content)."""
     import pandas as pd
+    if isinstance(value, pd.DataFrame):
+        h.update(repr(list(value.columns)).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    else:
+        h.update(repr(value).encode())
 
-    # Exhibit 1: State algorithm features + sensitivity
-    comparison = pd.DataFrame(results['comparison'])
-    comparison.to_csv(tables_dir / 'exhibit1_algorithm_comparison.csv', index=False)
-    print(f"  Saved: exhibit1_algorithm_comparison.csv")
 
-    # Exhibit 4: Coverage impact
-    coverage = pd.DataFrame(results['coverage_impact'])
-    coverage.to_csv(tables_dir / 'exhibit4_coverage_impact.csv', index=False)
-    print(f"  Saved: exhibit4_coverage_impact.csv")
+def disk_cache(cache_dir: Path = CACHE_DIR):
+    """
+    Memoize a pipeline step on disk, keyed by the inputs digest, the
+    function's qualified name and its arguments.
 
-    # Decomposition table
-    decomp = pd.DataFrame(results['decomposition'])
-    decomp.to_csv(tables_dir / 'etable_decomposition.csv', index=False)
-    print(f"  Saved: etable_decomposition.csv")
+    Re-running the pipeline to regenerate tables then skips every step whose
+    code, data and arguments are unchanged. DataFrame results are stored as
+    Parquet (unless they carry .attrs, which Parquet cannot hold); everything
+    else is pickled. Set PIPELINE_FORCE=1 to recompute and overwrite.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            h = hashlib.blake2b(digest_size=16)
+            h.update(_inputs_digest().encode())
+            h.update(f"{fn.__module__}.{fn.__qualname__}".encode())
+            for arg in args:
+                _arg_digest(h, arg)
+            for name, value in sorted(kwargs.items()):
+                h.update(name.encode())
+                _arg_digest(h, value)
+            import pandas as pd
+            stem = cache_dir / f"{fn.__name__}-{h.hexdigest()}"
+            parquet_path, pickle_path = stem.with_suffix('.parquet'), stem.with_suffix('.pkl')
+            if not os.environ.get('PIPELINE_FORCE'):
+                if parquet_path.exists():
+                    print(f"  (cached: {parquet_path.name})")
+                    return pd.read_parquet(parquet_path)
+                if pickle_path.exists():
+                    print(f"  (cached: {pickle_path.name})")
+                    with open(pickle_path, 'rb') as f:
+                        return pickle.load(f)
+            result = fn(*args, **kwargs)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            if isinstance(result, pd.DataFrame) and not result.attrs:
+                result.to_parquet(parquet_path, engine='pyarrow')
+            else:
+                with open(pickle_path, 'wb') as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return result
+        return wrapper
+    return decorator
 
-    # --- Step 3: Legacy analyses for eAppendix ---
-    print("\n\n[3/5] Running legacy analyses (eAppendix)...")
+
+def _json_default(o):
+    """orjson fallback: DataFrames as lists of records, anything else as str."""
+    import pandas as pd
+    if isinstance(o, pd.DataFrame):
+        return o.to_dict(orient='records')
+    return str(o)
+
+
+def _write_json(obj, path: Path, archive: bool = False) -> None:
+    """
+    Write a results dict as indented JSON via orjson. NumPy scalars and
+    arrays are encoded natively, DataFrames become lists of records, other
+    unknown types are stringified, and NaN/inf are written as null.
+
+    With archive=True the same bytes are also written gzip-compressed to
+    ``<path>.gz`` next to the plain file, for archiving.
+    """
+    import orjson
+    data = orjson.dumps(
+        obj, default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+    )
+    path.write_bytes(data)
+    if archive:
+        path.with_name(path.name + '.gz').write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def _legacy_audit_step():
+    """Step 3a: ACS algorithm audit (DataFrames are flattened by _write_json)."""
     try:
         from bias_analysis.algorithm_audit import run_full_audit
-        legacy = run_full_audit(n_sim=200, sample_n=1500)
-        results['legacy_audit'] = {
-            'simulation': legacy['simulation'].to_dict(orient='records') if not legacy['simulation'].empty else [],
-            'decomposition': legacy['decomposition'].to_dict(orient='records') if not legacy['decomposition'].empty else [],
-            'counterfactual': legacy['counterfactual'].to_dict(orient='records') if not legacy['counterfactual'].empty else [],
-            'regression': legacy['regression'],
-        }
+        legacy = disk_cache()(run_full_audit)(n_sim=200, sample_n=1500)
         print("  Legacy audit complete.")
+        return 'legacy_audit', {
+            key: legacy[key]
+            for key in ('simulation', 'decomposition', 'counterfactual', 'regression')
+        }
     except Exception as e:
         print(f"  Legacy audit skipped: {e}")
-        results['legacy_audit'] = {'error': str(e)}
+        return 'legacy_audit', {'error': str(e)}
+
 
+def _legacy_regression_step():
+    """Step 3b: state-level OLS disparity regression."""
     try:
         from pipeline.disparity_analysis import build_disparity_dataset, run_ols_disparity_regression
-        df = build_disparity_dataset(use_individual_level=False)
-        reg = run_ols_disparity_regression(df)
-        results['legacy_regression'] = reg
+        df = disk_cache()(build_disparity_dataset)(use_individual_level=False)
+        reg = disk_cache()(run_ols_disparity_regression)(df)
         print("  Legacy regression complete.")
+        return 'legacy_regression', reg
     except Exception as e:
         print(f"  Legacy regression skipped: {e}")
+        return 'legacy_regression', None
 
-    # --- Step 4: G2211 visit complexity validation ---
-    print("\n\n[4/5] G2211 visit complexity validation...")
+
+def _g2211_step():
+    """Step 4: G2211 visit complexity validation."""
     try:
         from bias_analysis.g2211_validation import run_g2211_validation
-        g2211_results = run_g2211_validation()
-        results['g2211_validation'] = g2211_results
-
-        # Save G2211 results separately
-        with open(output_dir / 'g2211_validation_results.json', 'w') as f:
-            json.dump(g2211_results, f, indent=2, default=str)
-        print(f"  Saved: {output_dir / 'g2211_validation_results.json'}")
+        return 'g2211_validation', run_g2211_validation()
     except FileNotFoundError as e:
         print(f"  G2211 validation skipped (data not yet extracted): {e}")
         print("  Run 'python data/stream_g2211.py' first, then re-run pipeline.")
-        results['g2211_validation'] = {'error': str(e)}
+        return 'g2211_validation', {'error': str(e)}
     except Exception as e:
         print(f"  G2211 validation skipped: {e}")
-        results['g2211_validation'] = {'error': str(e)}
+        return 'g2211_validation', {'error': str(e)}
+
+
+def _run_captured(step):
+    """
+    Run a (key, value) step with its stdout buffered, so worker progress
+    lines don't interleave with the main process. Returns (key, value, log).
+    """
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        key, value = step()
+    return key, value, buf.getvalue()
+
+
+def main():
+    if '--force' in sys.argv[1:]:
+        os.environ['PIPELINE_FORCE'] = '1'
+
+    print("=" * 70)
+    print("RECONCEPTUALIZED PIPELINE: Improved Frailty Algorithm Analysis")
+    print("=" * 70)
+
+    # Steps 3 and 4 do not depend on step 1, so start them in worker
+    # processes now and let them run alongside the main simulation. Their
+    # output is buffered and printed as each result is collected.
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        futures = [
+            pool.submit(_run_captured, step)
+            for step in (_legacy_audit_step, _legacy_regression_step, _g2211_step)
+        ]
+
+        # --- Step 1: Run improved algorithm analysis ---
+        print("\n\n[1/5] Running improved algorithm analysis...")
+        from bias_analysis.improved_algorithm import run_full_improved_analysis
+        results = disk_cache()(run_full_improved_analysis)(n_sim=300, sample_n=2000)
+
+        # Save primary results
+        TABLES_DIR.mkdir(parents=True, exist_ok=True)
+
+        _write_json(results, RESULTS_PATH)
+        print(f"  Saved: {RESULTS_PATH}")
+
+        # --- Step 2: Generate comparison table CSV ---
+        print("\n\n[2/5] Generating exhibit tables...")
+        import pandas as pd
+
+        # Exhibit 1: State algorithm features + sensitivity
+        comparison = pd.DataFrame(results['comparison'])
+        comparison.to_csv(TABLES_DIR / 'exhibit1_algorithm_comparison.csv', index=False)
+        print(f"  Saved: exhibit1_algorithm_comparison.csv")
+
+        # Exhibit 4: Coverage impact
+        coverage = pd.DataFrame(results['coverage_impact'])
+        coverage.to_csv(TABLES_DIR / 'exhibit4_coverage_impact.csv', index=False)
+        print(f"  Saved: exhibit4_coverage_impact.csv")
+
+        # Decomposition table
+        decomp = pd.DataFrame(results['decomposition'])
+        decomp.to_csv(TABLES_DIR / 'etable_decomposition.csv', index=False)
+        print(f"  Saved: etable_decomposition.csv")
+
+        # --- Steps 3-4: Collect the independent analyses started above ---
+        print("\n\n[3/5] Collecting legacy analyses (eAppendix)...")
+        print("[4/5] Collecting G2211 visit complexity validation...")
+        # Collect in submission order so the results JSON key order is stable
+        for future in futures:
+            key, value, log = future.result()
+            print(log, end='')
+            if value is not None:
+                results[key] = value
+
+    if 'error' not in results['g2211_validation']:
+        # Save G2211 results separately
+        _write_json(results['g2211_validation'], G2211_RESULTS_PATH)
+        print(f"  Saved: {G2211_RESULTS_PATH}")
 
     # --- Step 5: Save final combined results ---
     print("\n\n[5/5] Saving final results...")
-    with open(output_dir / 'improved_algorithm_results.json', 'w') as f:
-        json.dump(results, f, indent=2, default=str)
-    print(f"  Final results saved: {output_dir / 'improved_algorithm_results.json'}")
+    _write_json(results, RESULTS_PATH, archive=True)
+    print(f"  Final results saved: {RESULTS_PATH} (+ .gz)")
 
     # Print final summary
-    s = results['summary']
-    print(f"\n{'='*70}")
-    print("FINAL SUMMARY")
-    print(f"{'='*70}")
-    print(f"  States analyzed:              {s['n_states']}")
-    print(f"  ACS individuals:              {s['n_acs_individuals']:,}")
-    print(f"  Status quo sensitivity:       {s['mean_sq_overall_sensitivity']:.1f}%")
-    print(f"  Improved sensitivity:         {s['mean_imp_overall_sensitivity']:.1f}%")
-    print(f"  Sensitivity gain:             +{s['mean_sensitivity_gain_pp']:.1f}pp")
-    print(f"  B-W gap (status quo):         {s['mean_sq_bw_gap_pp']:.1f}pp")
-    print(f"  B-W gap (improved):           {s['mean_imp_bw_gap_pp']:.1f}pp")
-    print(f"  Gap reduction:                {s['mean_gap_reduction_pp']:.1f}pp ({s.get('mean_gap_reduction_pct', 0):.0f}%)")
-    print(f"  Additional frail identified:  {s['total_additional_identified']:,}")
-    print(f"  Coverage losses averted:      {s['total_coverage_losses_averted']:,}")
+    print(SUMMARY_TEMPLATE.format_map(
+        {'mean_gap_reduction_pct': 0, **results['summary']}
+    ))
 
 
 if __name__ == "__main__":